@@ -5,6 +5,7 @@ Splits large documents into chunks, summarizes each, and merges into a final sum
 """
 
 import argparse
+import asyncio
 import json
 import os
 import re
@@ -14,16 +15,20 @@ from typing import List, Dict, Any, Optional, Tuple
 from pathlib import Path
 
 import tiktoken
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI
 from openai import RateLimitError, APIError, APIConnectionError
 
+from rate_limiter import OPENAI_BUCKET
+
 # Constants
 MAX_CHUNK_TOKENS = 10000
 MAX_FINAL_WORDS = 300
 MAX_RETRIES = 3
 RETRY_DELAY = 2
+MAX_CONCURRENT_REQUESTS = 10
 GPT4O_MINI_INPUT_COST_PER_1K = 0.00015
 GPT4O_MINI_OUTPUT_COST_PER_1K = 0.0006
+CHUNK_SYSTEM_PROMPT = "You are an expert technical writer. Create concise, well-structured summaries using markdown and emojis. Focus on categorizing changes into: 🚀 New Features, 🐞 Bug Fixes, and 🧹 Improvements. Be specific and actionable."
 
 class Tokenizer:
     """Handles token counting and text chunking."""
@@ -84,21 +89,8 @@ class ChunkedSummarizer:
         
         for attempt in range(MAX_RETRIES):
             try:
-                response = self.client.chat.completions.create(
-                    model="gpt-4o-mini",
-                    messages=[
-                        {
-                            "role": "system",
-                            "content": "You are an expert technical writer. Create concise, well-structured summaries using markdown and emojis. Focus on categorizing changes into: 🚀 New Features, 🐞 Bug Fixes, and 🧹 Improvements. Be specific and actionable."
-                        },
-                        {
-                            "role": "user",
-                            "content": prompt
-                        }
-                    ],
-                    temperature=0.3,
-                    max_tokens=1000
-                )
+                OPENAI_BUCKET.acquire()
+                response = self.client.chat.completions.create(**self._chunk_request(prompt))
                 
                 summary = response.choices[0].message.content
                 print(f"✅ Chunk {chunk_index + 1}/{total_chunks} summarized successfully")
@@ -107,15 +99,81 @@ class ChunkedSummarizer:
             except (RateLimitError, APIError, APIConnectionError) as e:
                 if attempt < MAX_RETRIES - 1:
                     wait_time = RETRY_DELAY * (2 ** attempt)
-                    print(f"⚠️ Attempt {attempt + 1} failed: {e}. Retrying in {wait_time}s...")
+                    print(f"⚠️ Chunk {chunk_index + 1} attempt {attempt + 1} failed: {e}. Retrying in {wait_time}s...")
                     time.sleep(wait_time)
                 else:
-                    print(f"❌ Failed to summarize chunk {chunk_index + 1} after {MAX_RETRIES} attempts")
-                    return f"## Chunk {chunk_index + 1} Summary\n\n*Summary generation failed: {str(e)}*"
+                    return self._chunk_failure(chunk_index, e, retried=True)
             
             except Exception as e:
-                print(f"❌ Unexpected error summarizing chunk {chunk_index + 1}: {e}")
-                return f"## Chunk {chunk_index + 1} Summary\n\n*Summary generation failed: {str(e)}*"
+                return self._chunk_failure(chunk_index, e)
+    
+    def _chunk_request(self, prompt: str) -> Dict[str, Any]:
+        """Build the chat completion arguments for summarizing a chunk."""
+        return {
+            "model": "gpt-4o-mini",
+            "messages": [
+                {
+                    "role": "system",
+                    "content": CHUNK_SYSTEM_PROMPT
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            "temperature": 0.3,
+            "max_tokens": 1000
+        }
+    
+    def _chunk_failure(self, chunk_index: int, error: Exception, retried: bool = False) -> str:
+        """Report a chunk that couldn't be summarized and return its placeholder summary."""
+        if retried:
+            print(f"❌ Failed to summarize chunk {chunk_index + 1} after {MAX_RETRIES} attempts")
+        else:
+            print(f"❌ Unexpected error summarizing chunk {chunk_index + 1}: {error}")
+        return f"## Chunk {chunk_index + 1} Summary\n\n*Summary generation failed: {str(error)}*"
+    
+    async def _summarize_chunk_async(self, client: AsyncOpenAI, semaphore: asyncio.Semaphore,
+                                     chunk: str, chunk_index: int, total_chunks: int) -> str:
+        """Summarize a single chunk on the async client with retry logic."""
+        prompt = self._create_chunk_prompt(chunk, chunk_index, total_chunks)
+        
+        async with semaphore:
+            for attempt in range(MAX_RETRIES):
+                try:
+                    await OPENAI_BUCKET.acquire_async()
+                    response = await client.chat.completions.create(**self._chunk_request(prompt))
+                    
+                    summary = response.choices[0].message.content
+                    print(f"✅ Chunk {chunk_index + 1}/{total_chunks} summarized successfully")
+                    return summary
+                    
+                except (RateLimitError, APIError, APIConnectionError) as e:
+                    if attempt < MAX_RETRIES - 1:
+                        wait_time = RETRY_DELAY * (2 ** attempt)
+                        print(f"⚠️ Chunk {chunk_index + 1} attempt {attempt + 1} failed: {e}. Retrying in {wait_time}s...")
+                        await asyncio.sleep(wait_time)
+                    else:
+                        return self._chunk_failure(chunk_index, e, retried=True)
+                
+                except Exception as e:
+                    return self._chunk_failure(chunk_index, e)
+    
+    async def _summarize_chunks_async(self, chunks: List[str]) -> List[str]:
+        """Summarize all chunks concurrently, bounded by MAX_CONCURRENT_REQUESTS."""
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        async with AsyncOpenAI(api_key=self.openai_key) as client:
+            return await asyncio.gather(*[
+                self._summarize_chunk_async(client, semaphore, chunk, i, len(chunks))
+                for i, chunk in enumerate(chunks)
+            ])
+    
+    def summarize_chunks(self, chunks: List[str]) -> List[str]:
+        """Summarize chunks concurrently, returning summaries in chunk order."""
+        if not self.client:
+            raise ValueError("OpenAI client not initialized. Please set OPENAI_API_KEY.")
+        
+        return list(asyncio.run(self._summarize_chunks_async(chunks)))
     
     def _create_chunk_prompt(self, chunk: str, chunk_index: int, total_chunks: int) -> str:
         """Create prompt for chunk summarization."""
@@ -175,6 +233,7 @@ Create a summary that reads like a brief newspaper article about the week's deve
         # Generate final summary
         for attempt in range(MAX_RETRIES):
             try:
+                OPENAI_BUCKET.acquire()
                 response = self.client.chat.completions.create(
                     model="gpt-4o-mini",
                     messages=[
@@ -260,12 +319,9 @@ Create a summary that reads like a brief newspaper article about the week's deve
         # Multiple chunks - use chunked approach
         print(f"📝 Processing {len(chunks)} chunks...")
         
-        # Summarize each chunk
-        summaries = []
-        for i, chunk in enumerate(chunks):
-            print(f"📝 Processing chunk {i + 1}/{len(chunks)}...")
-            summary = self.summarize_chunk(chunk, i, len(chunks))
-            summaries.append(summary)
+        # Summarize chunks concurrently
+        print(f"📝 Summarizing up to {MAX_CONCURRENT_REQUESTS} chunks at a time...")
+        summaries = self.summarize_chunks(chunks)
         
         # Merge summaries
         print("🔗 Merging summaries...")
@@ -295,6 +351,7 @@ Requirements:
 Create a summary that reads like a brief newspaper article about the development progress."""
         
         try:
+            OPENAI_BUCKET.acquire()
             response = self.client.chat.completions.create(
                 model="gpt-4o-mini",
                 messages=[
@@ -326,7 +383,7 @@ def read_file(file_path: str) -> str:
     if not path.exists():
         raise FileNotFoundError(f"File not found: {file_path}")
     
-    if path.suffix.lower() not in ['.txt', '.md']:
+    if path.suffix.lower() not in {'.txt', '.md'}:
         raise ValueError(f"Unsupported file type: {path.suffix}. Only .txt and .md files are supported.")
     
     try:
@@ -345,8 +402,9 @@ def read_file(file_path: str) -> str:
 def save_summary(summary: str, output_file: str) -> None:
     """Save summary to file."""
     try:
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(summary)
+        data = summary.encode('utf-8')
+        with open(output_file, 'wb') as f:
+            f.write(data)
         print(f"💾 Summary saved to: {output_file}")
     except Exception as e:
         print(f"❌ Error saving summary: {e}")
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+GitHub Response Cache
+File-backed cache of GitHub API responses with TTL freshness and ETag/Last-Modified revalidation.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import time
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger("digest")
+
+GITHUB_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'weekly-digest')
+GITHUB_LIST_TTL = 15 * 60  # PR lists and search results change as PRs merge
+GITHUB_DETAIL_TTL = 24 * 3600  # Details of merged PRs (e.g. their commits) no longer change
+GITHUB_CACHE_MAX_AGE = 14 * 24 * 3600  # Cache files untouched this long are deleted; outlives a weekly run's watermark
+
+# Freshness lifetime in Cache-Control response headers
+_MAX_AGE_RE = re.compile(r'max-age=(\d+)')
+
+def json_loads(data: bytes) -> Any:
+    """Parse JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def json_dumps(obj: Any, indent: bool = False, sort_keys: bool = False) -> bytes:
+    """Serialize to UTF-8 JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, option=option, default=str)
+    return json.dumps(
+        obj,
+        indent=2 if indent else None,
+        separators=None if indent else (',', ':'),
+        sort_keys=sort_keys,
+        ensure_ascii=False,
+        default=str
+    ).encode('utf-8')
+
+def read_fresh_file(path: str, ttl: float) -> Optional[bytes]:
+    """Read a cache file if it was written within the last ttl seconds."""
+    try:
+        if time.time() - os.path.getmtime(path) > ttl:
+            return None
+        with open(path, 'rb') as f:
+            return f.read()
+    except OSError:
+        return None
+
+def write_cache_file(path: str, data: bytes) -> None:
+    """Write a cache file atomically, warning instead of failing on errors."""
+    tmp_path = None
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # A unique temp file, so concurrent threads and overlapping runs never share one
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning(f"⚠️ Warning: Failed to write cache file {path}: {e}")
+        if tmp_path:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+@lru_cache(maxsize=None)
+def prune_cache_dir(cache_dir: str, max_age: float = GITHUB_CACHE_MAX_AGE) -> None:
+    """Delete cache files not written for max_age seconds, once per directory per process."""
+    cutoff = time.time() - max_age
+    try:
+        entries = list(os.scandir(cache_dir))
+    except OSError:
+        return
+    for entry in entries:
+        try:
+            if entry.is_file() and entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+        except OSError:
+            pass
+
+def _max_age_expiry(headers: Dict[str, str]) -> float:
+    """Get the time a response stays fresh until under its Cache-Control max-age, or 0."""
+    cache_control = headers.get('Cache-Control') or ''
+    match = _MAX_AGE_RE.search(cache_control)
+    if not match or 'no-cache' in cache_control or 'no-store' in cache_control:
+        return 0
+    return time.time() + int(match.group(1))
+
+class GitHubCache:
+    """File-backed GitHub responses with their validators, freshness and TTL."""
+    
+    def __init__(self, cache_dir: str = GITHUB_CACHE_DIR):
+        """Set up the cache directory, pruning files no run has used for a while."""
+        self.cache_dir = cache_dir
+        prune_cache_dir(cache_dir)
+    
+    def _path(self, url: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """Get the on-disk path of the entry for a URL and its query parameters."""
+        key = url.encode('utf-8') + json_dumps(params or {}, sort_keys=True)
+        return os.path.join(self.cache_dir, f"{hashlib.sha256(key).hexdigest()}.json")
+    
+    def get(self, url: str, params: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """Load the cached entry for a request, if any."""
+        try:
+            with open(self._path(url, params), 'rb') as f:
+                return json_loads(f.read())
+        except (OSError, ValueError):
+            return None
+    
+    def put(self, url: str, params: Optional[Dict[str, Any]], entry: Dict[str, Any]) -> None:
+        """Store the entry for a request, replacing any previous one atomically."""
+        write_cache_file(self._path(url, params), json_dumps(entry))
+    
+    @staticmethod
+    def is_fresh(entry: Dict[str, Any]) -> bool:
+        """Check whether an entry can be used without revalidating it."""
+        fresh_until = max(entry.get('timestamp', 0) + entry.get('ttl', 0), entry.get('expires', 0))
+        return fresh_until > time.time()
+    
+    @staticmethod
+    def conditional_headers(entry: Dict[str, Any]) -> Dict[str, str]:
+        """Build the If-None-Match / If-Modified-Since headers that revalidate an entry."""
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+    
+    @staticmethod
+    def make_entry(body: Any, headers: Dict[str, str], status: int, ttl: float) -> Dict[str, Any]:
+        """Build an entry for a response body and its headers."""
+        return {
+            'body': body,
+            'etag': headers.get('ETag'),
+            'last_modified': headers.get('Last-Modified'),
+            'status': status,
+            'timestamp': time.time(),
+            'ttl': ttl,
+            'expires': _max_age_expiry(headers)
+        }
+    
+    def refresh(self, url: str, params: Optional[Dict[str, Any]], entry: Dict[str, Any], headers: Dict[str, str]) -> None:
+        """Restart an entry's freshness after a 304 revalidated it."""
+        self.put(url, params, {**entry, 'timestamp': time.time(), 'expires': _max_age_expiry(headers)})
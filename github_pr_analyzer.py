@@ -4,26 +4,205 @@ GitHub PR Analyzer with Linear Integration and Slack Support
 Generates business-friendly summaries of Pull Requests with Linear issue details.
 """
 
-import requests
-import json
 import argparse
+import hashlib
+import itertools
+import json
+import logging
+import logging.handlers
 import os
 import sys
 import re
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextvars import ContextVar
 from datetime import datetime, timedelta, timezone
-from typing import List, Dict, Any, Optional, Tuple
-import openai
-from openai import OpenAI
+from functools import lru_cache
+from typing import TYPE_CHECKING, Callable, List, Dict, Any, Optional, Tuple
+
+from github_cache import (
+    GITHUB_CACHE_DIR, GITHUB_DETAIL_TTL, GITHUB_LIST_TTL, GitHubCache,
+    json_dumps, json_loads, read_fresh_file, write_cache_file
+)
+from rate_limiter import OPENAI_BUCKET, TokenPool, github_bucket, search_bucket
+
+# requests and openai are imported on first use so code paths that never
+# reach the network (or never call the LLM) don't pay their import cost
+if TYPE_CHECKING:
+    import requests
+    from openai import OpenAI
+
+# Progress output goes through a buffered logger and is written to stdout in
+# batches when stdout is redirected; on a terminal every line is written as it
+# is logged. Warnings and errors flush immediately, and the buffer is flushed
+# before any direct console output (interactive prompts, the final summary) and at exit
+logger = logging.getLogger("digest")
+logger.setLevel(logging.INFO)
+logger.propagate = False
+_console_handler = logging.StreamHandler(sys.stdout)
+_console_handler.setFormatter(logging.Formatter('%(message)s'))
+_log_buffer = logging.handlers.MemoryHandler(
+    capacity=1 if sys.stdout.isatty() else 100, flushLevel=logging.WARNING, target=_console_handler
+)
+logger.addHandler(_log_buffer)
+
+# Repository whose work the current thread is doing, used to tell apart the
+# interleaved log lines of repos analyzed concurrently
+_log_repo: ContextVar[Optional[str]] = ContextVar('log_repo', default=None)
+
+class _RepoLogPrefix(logging.Filter):
+    """Prefixes log messages with the repository being analyzed, if any."""
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        repo = _log_repo.get()
+        if repo:
+            message = record.getMessage()
+            text = message.lstrip('\n')
+            record.msg = f"{message[:len(message) - len(text)]}[{repo}] {text}"
+            record.args = ()
+        return True
+
+logger.addFilter(_RepoLogPrefix())
 
 # Constants
 DEFAULT_BRANCHES = ['main-v3']
 DEFAULT_TIME_RANGE = '1w'
+PRS_PER_CHUNK = 10  # PRs per concurrently summarized chunk in chunked mode
+PR_BODY_TOKEN_BUDGET = 6000  # Tokens shared by all PR descriptions in chunked mode
+PR_BODY_MAX_TOKENS = 125  # Per-PR description cap when there are few PRs
 MAX_SLACK_TEXT_LENGTH = 3000
+SLACK_SECTION_LENGTH = 2900  # Section text is packed below Slack's 3000-character limit
+SLACK_MAX_BLOCKS = 50
 MAX_SLACK_SIMPLE_LENGTH = 40000
 SLACK_API_BASE = "https://slack.com/api/chat.postMessage"
+SLACK_TIMEOUT = (5, 30)  # Connect and read timeouts in seconds
+_BANNER = "🎉" + "=" * 78 + "🎉"
+DIGEST_CACHE_TTL = 3600  # Seconds fetched PRs and generated summaries are reused for identical inputs
+WATERMARK_OVERLAP = timedelta(hours=6)  # Re-fetch this far behind the last fetch to catch late-indexed merges
+GITHUB_SEARCH_URL = "https://api.github.com/search/issues"
+GITHUB_SEARCH_MAX_RESULTS = 1000  # The Search API never returns more than this per query
+GITHUB_GRAPHQL_URL = "https://api.github.com/graphql"
+GITHUB_GRAPHQL_BATCH = 50  # PRs per GraphQL query
+GITHUB_GRAPHQL_LOW_POINTS = 100
+_PR_STATS_FIELDS = "number additions deletions changedFiles commits { totalCount }"
+GITHUB_PER_PAGE = 100
+GITHUB_PAGE_WAVE = 4  # Pages requested concurrently once a branch has more than one page
+GITHUB_MAX_WORKERS = 8
+MAX_PARALLEL_REPOS = 4  # Repos analyzed at once; they share the GitHub and OpenAI rate limits
+HTTP_POOL_MAXSIZE = 64  # Enough keep-alive connections for concurrent branch and page fetches
+HTTP_RETRY_STATUSES = (502, 503, 504)  # Rate limits (403/429) are handled by _get_with_ratelimit
+GITHUB_RATE_LIMIT_FLOOR = 10  # Wait for the reset once fewer requests than this remain
+GITHUB_RATE_LIMIT_RETRIES = 5
+GITHUB_RATE_LIMIT_LOG_EVERY = 100
+
+# PR fields used downstream; everything else in the GitHub payload is dropped at ingest
+_PR_KEEP = (
+    'number', 'title', 'body', 'merged_at', 'html_url', 'user',
+    'additions', 'deletions', 'changed_files', 'commits', 'commits_url'
+)
+
+# Static blocks are built once and shared by every message; Slack only reads them
+_DIVIDER = {"type": "divider"}
+
+def _header_block(text: str) -> Dict[str, Any]:
+    """Build a Slack header block."""
+    return {"type": "header", "text": {"type": "plain_text", "text": text, "emoji": True}}
+
+def _section_block(text: str) -> Dict[str, Any]:
+    """Build a Slack section block of mrkdwn text."""
+    return {"type": "section", "text": {"type": "mrkdwn", "text": text}}
+
+def _context_block(text: str) -> Dict[str, Any]:
+    """Build a Slack context block with a single mrkdwn element."""
+    return {"type": "context", "elements": [{"type": "mrkdwn", "text": text}]}
+
+def _pack_pieces(pieces: List[str], separator: str, max_length: int) -> List[str]:
+    """Greedily join pieces (each at most max_length long) into chunks of at most max_length characters."""
+    chunks = []
+    current: List[str] = []
+    size = 0
+    for piece in pieces:
+        added = len(piece) + (len(separator) if current else 0)
+        if current and size + added > max_length:
+            chunks.append(separator.join(current))
+            current, size, added = [], 0, len(piece)
+        current.append(piece)
+        size += added
+    if current:
+        chunks.append(separator.join(current))
+    return chunks
+
+def _split_paragraphs(text: str, max_length: int = SLACK_SECTION_LENGTH) -> List[str]:
+    """Split text into chunks of at most max_length characters, preferring paragraph then line boundaries."""
+    if len(text) <= max_length:
+        return [text]
+    
+    pieces = []
+    for paragraph in text.split('\n\n'):
+        if len(paragraph) <= max_length:
+            pieces.append(paragraph)
+            continue
+        lines = []
+        for line in paragraph.split('\n'):
+            if len(line) <= max_length:
+                lines.append(line)
+            else:
+                lines.extend(line[i:i + max_length] for i in range(0, len(line), max_length))
+        pieces.extend(_pack_pieces(lines, '\n', max_length))
+    return _pack_pieces(pieces, '\n\n', max_length)
+
+# Blocks closing every digest message
+_SLACK_FOOTER_BLOCKS = (
+    _DIVIDER,
+    _context_block("🤖 Powered by GitHub PR Analyzer | 🎉 Keep building amazing things!")
+)
+
+# Digest section titles rendered as Slack header blocks
+_SLACK_SECTION_HEADERS = (
+    "📊 This Week's Highlights",
+    "🚀 What's New",
+    "⚡ Level Up",
+    "🐛 Bug Squashed",
+    "🔧 Behind the Scenes",
+    "👥 MVP Contributors"
+)
+
+# Markdown -> Slack formatting patterns (compiled once, used on every summary)
+_RE_LINE_PREFIX = re.compile(r'^(#{1,3} |- |\d+\. )(.+)$', re.MULTILINE)
+_RE_EMPHASIS = re.compile(r'\*\*(.+?)\*\*|(?<!\*)\*([^*]+?)\*(?!\*)')
+_RE_CODEBLOCK = re.compile(r'```(.+?)```', re.DOTALL)
+_RE_CUSTOM_LINK = re.compile(r'<https://[^>]+>')
+_RE_LINK = re.compile(r'\[([^\]]+)\]\(([^)]+)\)')
+_RE_NEWLINES = re.compile(r'\n{3,}')
+_RE_BULLET_FIX = re.compile(r'•\s*\n\s*•')
+
+# Slack emoji codes the LLM sometimes emits instead of the emoji itself
+_EMOJI_MAP = {
+    ':bar_chart:': '📊',
+    ':date:': '📅',
+    ':alarm_clock:': '⏰',
+    ':rocket:': '🚀',
+    ':zap:': '⚡',
+    ':bug:': '🐛',
+    ':wrench:': '🔧',
+    ':busts_in_silhouette:': '👥',
+    ':robot_face:': '🤖',
+}
+_EMOJI_RE = re.compile('|'.join(re.escape(code) for code in _EMOJI_MAP))
+
+# PR references (#123) in generated summaries
+_PR_NUM_RE = re.compile(r'#(\d+)')
+
+# Interactive time range menu: preset choices and the expected date format
+_TIME_RANGE_CHOICES = {'1': '1w', '2': '1m', '3': '6m', '4': '1y'}
+_DATE_RE = re.compile(r'^\d{4}-\d{2}-\d{2}$')
 
 # Linear API configuration
 LINEAR_API_BASE = "https://api.linear.app/graphql"
+_HIGH_PRIORITIES = frozenset(('Urgent', 'High'))
+LINEAR_CACHE_TTL = 300  # Seconds a fetched Linear issue is reused within a process
 LINEAR_QUERY = """
 query Issue($id: String!) {
   issue(id: $id) {
@@ -67,30 +246,222 @@ query Issue($id: String!) {
 }
 """
 
+def _is_valid_date(date_str: str) -> bool:
+    """Check a YYYY-MM-DD date string, rejecting malformed input before parsing."""
+    if not _DATE_RE.match(date_str):
+        return False
+    try:
+        datetime.fromisoformat(date_str)
+        return True
+    except ValueError:
+        return False
+
+@lru_cache(maxsize=1)
+def _requests() -> Any:
+    """Get the requests module, importing it on first use."""
+    import requests
+    return requests
+
+@lru_cache(maxsize=1)
+def _token_encoding() -> Optional[Any]:
+    """Get the gpt-4o-mini tokenizer, or None if tiktoken isn't installed."""
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    return tiktoken.encoding_for_model("gpt-4o-mini")
+
+@lru_cache(maxsize=1)
+def _slack_session() -> 'requests.Session':
+    """Get the pooled Slack HTTP session shared by every SlackClient in the process."""
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+    
+    # Only retry what Slack never processed: connection failures and 429s,
+    # honoring Retry-After. Replaying a 5xx or read timeout could double-post.
+    retry = Retry(
+        total=5,
+        read=0,
+        backoff_factor=0.5,
+        status_forcelist=(429,),
+        allowed_methods=None,
+        respect_retry_after_header=True,
+        raise_on_status=False
+    )
+    session = _requests().Session()
+    session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=10, max_retries=retry))
+    return session
+
+def _truncate_tokens(text: str, max_tokens: int) -> str:
+    """Truncate text to at most max_tokens tokens, marking cut text with '...'."""
+    encoding = _token_encoding()
+    if encoding is None:
+        max_chars = max_tokens * 4  # Typical characters per token for English text
+        return text if len(text) <= max_chars else text[:max_chars] + "..."
+    tokens = encoding.encode(text)
+    if len(tokens) <= max_tokens:
+        return text
+    return encoding.decode(tokens[:max_tokens]) + "..."
+
+def _group_by_branch(prs: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    """Group PRs by base branch, keeping first-seen branch order."""
+    grouped = defaultdict(list)
+    for pr in prs:
+        grouped[pr.get('base_branch', 'unknown')].append(pr)
+    return dict(grouped)
+
+def _int_header(headers: Dict[str, str], name: str) -> Optional[int]:
+    """Get an integer response header, or None if it's missing or not a number (e.g. an HTTP-date Retry-After)."""
+    try:
+        return int(headers[name])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+def _flush_log() -> None:
+    """Write any buffered progress messages to the console."""
+    _log_buffer.flush()
+
+def _worker_pool(max_workers: int) -> ThreadPoolExecutor:
+    """Create a thread pool whose workers log under the caller's repository."""
+    return ThreadPoolExecutor(max_workers=max_workers, initializer=_log_repo.set, initargs=(_log_repo.get(),))
+
+# Work currently in progress, shared with concurrent callers asking for the same thing
+_inflight: Dict[Tuple, Future] = {}
+_inflight_lock = threading.Lock()
+
+def _single_flight(key: Tuple, compute: Callable[[], Any]) -> Any:
+    """Run compute once for concurrent callers with the same key and share its result (or error)."""
+    with _inflight_lock:
+        future = _inflight.get(key)
+        owner = future is None
+        if owner:
+            future = _inflight[key] = Future()
+    
+    if not owner:
+        logger.info("♻️ Waiting for the identical request already in progress")
+        return future.result()
+    
+    try:
+        result = compute()
+        future.set_result(result)
+        return result
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _inflight_lock:
+            del _inflight[key]
+
+@lru_cache(maxsize=1)
+def _run_started() -> datetime:
+    """Get the (UTC) time the run started, fixed on first use so every repo and message shares it."""
+    return datetime.now(timezone.utc)
+
+@lru_cache(maxsize=1)
+def _run_timestamp() -> str:
+    """Get the run's display timestamp."""
+    return _run_started().strftime('%Y-%m-%d %H:%M UTC')
+
+@lru_cache(maxsize=1)
+def _run_file_timestamp() -> str:
+    """Get the run's timestamp for file names, in local time."""
+    return _run_started().astimezone().strftime('%Y%m%d_%H%M%S')
+
+def _format_slack_line(match: re.Match) -> str:
+    """Render a markdown header or list line in Slack formatting."""
+    prefix, text = match.groups()
+    if prefix[0] == '#':
+        # The header itself is rendered bold, so drop bold markers inside it
+        text = text.replace('*', '')
+        return f'*📊 {text}*' if prefix == '# ' else f'*{text}*'
+    return f'• {text}'
+
+def _format_slack_emphasis(match: re.Match) -> str:
+    """Render markdown bold (**text**) as Slack bold and italic (*text*) as Slack italic."""
+    bold, italic = match.groups()
+    if bold is not None:
+        return f'*{bold}*'
+    return f'_{italic}_'
+
+@lru_cache(maxsize=8)
+def _format_for_slack(markdown_text: str) -> str:
+    """Convert markdown to Slack-friendly formatting (memoized for repeat sends)."""
+    if not markdown_text:
+        return ""
+    
+    # Convert markdown to Slack formatting
+    formatted = markdown_text
+    
+    # Bold and italic in one pass, so converted bold (*text*) is never
+    # re-matched as italic - **text** becomes *text*, *text* becomes _text_
+    formatted = _RE_EMPHASIS.sub(_format_slack_emphasis, formatted)
+    
+    # Headers and lists in one pass - headers become bold (with an emoji for
+    # top-level headers), dashed and numbered list items become bullet points
+    formatted = _RE_LINE_PREFIX.sub(_format_slack_line, formatted)
+    
+    # Code blocks
+    formatted = _RE_CODEBLOCK.sub(r'`\1`', formatted)
+    
+    # Inline code already uses Slack's single-backtick syntax
+    
+    # Links - convert markdown links to Slack format (but preserve existing custom links)
+    if '[' in formatted:
+        # First, temporarily replace existing custom links to protect them
+        custom_links = _RE_CUSTOM_LINK.findall(formatted)
+        for i, link in enumerate(custom_links):
+            formatted = formatted.replace(link, f'__CUSTOM_LINK_{i}__')
+        
+        # Convert markdown links to Slack format
+        formatted = _RE_LINK.sub(r'<\2|\1>', formatted)
+        
+        # Restore custom links
+        for i, link in enumerate(custom_links):
+            formatted = formatted.replace(f'__CUSTOM_LINK_{i}__', link)
+    
+    # Clean up emoji codes and replace with actual emojis
+    formatted = _EMOJI_RE.sub(lambda m: _EMOJI_MAP[m.group(0)], formatted)
+    
+    # Remove extra newlines and clean up spacing
+    formatted = _RE_NEWLINES.sub('\n\n', formatted)
+    formatted = _RE_BULLET_FIX.sub('•', formatted)  # Fix bullet point spacing
+    
+    return formatted.strip()
+
 class GitHubPRAnalyzer:
     """Main analyzer class for GitHub PRs with Linear integration."""
     
     def __init__(self, github_token: Optional[str] = None, openai_key: Optional[str] = None, 
-                 linear_token: Optional[str] = None, save_raw_data: bool = True):
-        """Initialize the analyzer with all required tokens."""
-        self.github_token = github_token or os.getenv('GITHUB_TOKEN')
+                 linear_token: Optional[str] = None, save_raw_data: bool = True,
+                 use_cache: bool = True, stream_output: bool = False, refresh: bool = False,
+                 github_tokens: Optional[List[str]] = None, full_refresh: bool = False):
+        """Initialize the analyzer with all required tokens (github_tokens or GITHUB_TOKENS are rotated per request)."""
+        if not github_tokens and github_token:
+            github_tokens = [github_token]
+        if not github_tokens:
+            github_tokens = [t.strip() for t in os.getenv('GITHUB_TOKENS', '').split(',') if t.strip()]
+        if not github_tokens and os.getenv('GITHUB_TOKEN'):
+            github_tokens = [os.getenv('GITHUB_TOKEN')]
+        self.github_token = github_tokens[0] if github_tokens else None
+        self._github_tokens = TokenPool(github_tokens) if github_tokens else None
         self.openai_key = openai_key or os.getenv('OPENAI_API_KEY')
         self.linear_token = linear_token or os.getenv('LINEAR_API_KEY')
         self.save_raw_data = save_raw_data
-        
-        # GitHub setup
+        self.use_cache = use_cache
+        self.refresh = refresh
+        self.full_refresh = full_refresh
+        self.http_cache = GitHubCache() if use_cache else None
+        self.stream_output = stream_output
+        self.summary_streamed = False
+        
+        # GitHub setup (the Authorization header is added per request from the token pool)
         self.github_headers = {
             'Accept': 'application/vnd.github.v3+json',
             'User-Agent': 'GitHub-PR-Analyzer'
         }
-        if self.github_token:
-            self.github_headers['Authorization'] = f'token {self.github_token}'
         
-        # OpenAI setup
-        if self.openai_key:
-            self.openai_client = OpenAI(api_key=self.openai_key)
-        else:
-            self.openai_client = None
+        # OpenAI setup (client is created on first use)
+        self._openai_client: Optional['OpenAI'] = None
         
         # Linear setup
         if self.linear_token:
@@ -100,6 +471,45 @@ class GitHubPRAnalyzer:
             }
         else:
             self.linear_headers = None
+        self._linear_cache: Dict[str, Tuple[float, Optional[Dict[str, Any]]]] = {}
+        
+        self._session: Optional['requests.Session'] = None
+        self._session_lock = threading.Lock()
+        self._github_calls = itertools.count(1)
+    
+    @property
+    def session(self) -> 'requests.Session':
+        """Get the pooled HTTP session for GitHub and Linear, creating it on first use."""
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    from requests.adapters import HTTPAdapter
+                    from urllib3.util.retry import Retry
+                    
+                    # Keep connections alive across requests and retry transient failures
+                    retry = Retry(
+                        total=5,
+                        backoff_factor=0.5,
+                        status_forcelist=HTTP_RETRY_STATUSES,
+                        respect_retry_after_header=True,
+                        raise_on_status=False
+                    )
+                    session = _requests().Session()
+                    session.mount('https://', HTTPAdapter(
+                        pool_connections=10,
+                        pool_maxsize=HTTP_POOL_MAXSIZE,
+                        max_retries=retry
+                    ))
+                    self._session = session
+        return self._session
+    
+    @property
+    def openai_client(self) -> Optional['OpenAI']:
+        """Get the OpenAI client, creating it on first use."""
+        if self._openai_client is None and self.openai_key:
+            from openai import OpenAI
+            self._openai_client = OpenAI(api_key=self.openai_key)
+        return self._openai_client
     
     def get_time_range(self, time_range: str) -> Tuple[str, str]:
         """Get start and end dates based on time range string."""
@@ -142,29 +552,60 @@ class GitHubPRAnalyzer:
         return datetime.fromisoformat(date_str).replace(tzinfo=timezone.utc)
     
     def fetch_prs(self, repo: str, branches: List[str], time_range: str) -> List[Dict[str, Any]]:
-        """Fetch PRs from specified branches within time range."""
+        """Fetch PRs from specified branches within time range, sharing concurrent identical fetches."""
+        key = ('prs', repo, tuple(sorted(set(branches))), time_range)
+        return list(_single_flight(key, lambda: self._fetch_prs(repo, branches, time_range)))
+    
+    def _fetch_prs(self, repo: str, branches: List[str], time_range: str) -> List[Dict[str, Any]]:
+        """Fetch PRs for fetch_prs, going through the digest cache."""
+        digest_file = None
+        if self.use_cache:
+            key = hashlib.sha256(f"{repo}|{sorted(set(branches))}|{time_range}".encode('utf-8')).hexdigest()
+            digest_file = os.path.join(GITHUB_CACHE_DIR, f"digest_{key}.json")
+            cached = None if self.refresh or self.full_refresh else read_fresh_file(digest_file, DIGEST_CACHE_TTL)
+            digest = json_loads(cached) if cached is not None else None
+            if isinstance(digest, dict):
+                all_prs = digest['prs']
+                logger.info(f"♻️ Reusing {len(all_prs)} PRs fetched for the same inputs within the last hour")
+                if self.save_raw_data:
+                    self._save_raw_data(all_prs, repo, time_range, *self.get_time_range(time_range),
+                                        fetched_at=digest['fetched_at'])
+                return all_prs
+        
         start_date, end_date = self.get_time_range(time_range)
-        print(f"📅 Fetching PRs from {start_date} to {end_date}")
+        logger.info(f"📅 Fetching PRs from {start_date} to {end_date}")
         
         all_prs = []
+        complete = True  # Only a fully successful fetch is saved to the digest cache
         linear_enabled = bool(self.linear_token)
+        branches = self._validate_branches(repo, list(dict.fromkeys(branches)))  # Drop repeated and missing branches
         
-        for branch in branches:
-            print(f"🌿 Fetching PRs from {branch}...")
-            branch_prs = self._fetch_branch_prs(repo, branch, start_date, end_date)
-            all_prs.extend(branch_prs)
+        # Branches are independent, so fetch them concurrently
+        with _worker_pool(max(1, min(GITHUB_MAX_WORKERS, len(branches)))) as executor:
+            branch_results = executor.map(
+                lambda branch: self._fetch_branch_prs(repo, branch, start_date, end_date),
+                branches
+            )
+            for branch_prs, branch_complete in branch_results:
+                all_prs.extend(branch_prs)
+                complete = complete and branch_complete
         
-        # Remove duplicates and sort by merge date
+        # Remove duplicates (first branch wins) and sort by merge date; GitHub's
+        # fixed-format UTC timestamps sort correctly as strings
         unique_prs = {}
         for pr in all_prs:
-            pr_id = pr['number']
-            if pr_id not in unique_prs:
-                unique_prs[pr_id] = pr
+            unique_prs.setdefault(pr['number'], pr)
         
         all_prs = list(unique_prs.values())
-        all_prs.sort(key=lambda x: x.get('merged_at', ''), reverse=True)
+        all_prs.sort(key=lambda pr: pr.get('merged_at') or '', reverse=True)
+        
+        # Resolve authors once; statistics and prompts reuse pr['_author']
+        for pr in all_prs:
+            pr['_author'] = self._get_pr_author(pr)
         
-        print(f"✅ Found {len(all_prs)} PRs")
+        logger.info(f"✅ Found {len(all_prs)} PRs")
+        
+        complete = self._fetch_pr_stats(repo, all_prs) and complete
         
         # Save raw data if enabled
         if self.save_raw_data:
@@ -172,80 +613,364 @@ class GitHubPRAnalyzer:
         
         # Extract Linear IDs and fetch details
         if linear_enabled:
-            linear_prs = [pr for pr in all_prs if self._extract_linear_id(pr)]
-            print(f"🔗 Linear integration enabled - found {len(linear_prs)} PRs with Linear IDs")
-            
-            for pr in linear_prs:
+            linear_prs = []
+            for pr in all_prs:
                 linear_id = self._extract_linear_id(pr)
                 if linear_id:
-                    print(f"🔗 Found Linear ID in PR #{pr['number']}: {linear_id}")
-                    linear_details = self._fetch_linear_details(linear_id)
-                    if linear_details:
-                        print(f"📋 Fetched Linear details for {linear_id}: {linear_details.get('title', '')[:50]}...")
-                        pr['linear_details'] = linear_details
+                    linear_prs.append((pr, linear_id))
+            logger.info(f"🔗 Linear integration enabled - found {len(linear_prs)} PRs with Linear IDs")
+            
+            for pr, linear_id in linear_prs:
+                logger.info(f"🔗 Found Linear ID in PR #{pr['number']}: {linear_id}")
+                linear_details = self._fetch_linear_details(linear_id)
+                if linear_details:
+                    logger.info(f"📋 Fetched Linear details for {linear_id}: {linear_details.get('title', '')[:50]}...")
+                    pr['linear_details'] = linear_details
+                elif linear_id not in self._linear_cache:  # Only successful lookups are cached
+                    complete = False
+        
+        if digest_file and complete:
+            write_cache_file(digest_file, json_dumps({'fetched_at': _run_started().isoformat(), 'prs': all_prs}))
         
         return all_prs
     
-    def _fetch_branch_prs(self, repo: str, branch: str, start_date: str, end_date: str) -> List[Dict[str, Any]]:
-        """Fetch PRs for a specific branch."""
-        prs = []
-        page = 1
-        per_page = 100
+    def _github_get(self, url: str, params: Optional[Dict[str, Any]] = None, ttl: float = GITHUB_LIST_TTL) -> Any:
+        """GET a GitHub API resource through the response cache, revalidating stale entries."""
+        headers = self.github_headers
+        cached = self.http_cache.get(url, params) if self.http_cache else None
+        if cached and not self.refresh and self.http_cache.is_fresh(cached):
+            return cached['body']
+        if cached:
+            headers = {**self.github_headers, **self.http_cache.conditional_headers(cached)}
         
-        while True:
-            try:
-                url = f"https://api.github.com/repos/{repo}/pulls"
-                params = {
-                    'state': 'closed',
-                    'base': branch,
-                    'sort': 'updated',
-                    'direction': 'desc',
-                    'per_page': per_page,
-                    'page': page
-                }
-                
-                response = requests.get(url, headers=self.github_headers, params=params)
-                response.raise_for_status()
-                
-                page_prs = response.json()
-                if not page_prs:
-                    break
+        response = self._get_with_ratelimit(url, headers, params)
+        
+        # 304 responses don't count against the rate limit; reuse the stored body
+        if response.status_code == 304 and cached:
+            self.http_cache.refresh(url, params, cached, response.headers)
+            return cached['body']
+        
+        response.raise_for_status()
+        data = json_loads(response.content)
+        
+        if self.http_cache:
+            self.http_cache.put(url, params, self.http_cache.make_entry(data, response.headers, response.status_code, ttl))
+        
+        return data
+    
+    def _send_github(self, url: str, headers: Dict[str, str], params: Optional[Dict[str, Any]] = None,
+                     json: Optional[Dict[str, Any]] = None) -> Tuple[Optional[str], 'requests.Response']:
+        """Send a GitHub request (a POST when json is given) with the next token, returning the token and response."""
+        token = self._github_tokens.next() if self._github_tokens else None
+        buckets = [github_bucket(token)]
+        if url == GITHUB_SEARCH_URL:
+            buckets.append(search_bucket(token))
+        for bucket in buckets:
+            bucket.acquire()
+        if token:
+            headers = {**headers, 'Authorization': f'token {token}'}
+        if json is not None:
+            return token, self.session.post(url, headers=headers, json=json)
+        response = self.session.get(url, headers=headers, params=params)
+        if response.status_code == 304:  # Revalidations don't count against the rate limit
+            for bucket in buckets:
+                bucket.refund()
+        return token, response
+    
+    def _get_with_ratelimit(self, url: str, headers: Dict[str, str], params: Optional[Dict[str, Any]] = None) -> 'requests.Response':
+        """GET from GitHub, rotating out exhausted tokens and waiting out rate limits instead of failing."""
+        for attempt in range(GITHUB_RATE_LIMIT_RETRIES + 1):
+            token, response = self._send_github(url, headers, params)
+            
+            remaining = _int_header(response.headers, 'X-RateLimit-Remaining')
+            reset = _int_header(response.headers, 'X-RateLimit-Reset')
+            retry_after = _int_header(response.headers, 'Retry-After')
+            # The Search API has its own per-minute quota; running it down only pauses searches
+            searching = response.headers.get('X-RateLimit-Resource') == 'search'
+            
+            if next(self._github_calls) % GITHUB_RATE_LIMIT_LOG_EVERY == 0 and remaining is not None:
+                logger.info(f"📊 GitHub rate limit: {remaining} requests remaining")
+            
+            reset_wait = max(0, reset - time.time()) if reset else 0
+            
+            # Secondary limits answer 403/429 with Retry-After; an exhausted primary limit
+            # answers 403 with zero remaining and a reset time
+            if response.status_code in (403, 429) and attempt < GITHUB_RATE_LIMIT_RETRIES:
+                if 'Retry-After' in response.headers:
+                    # An HTTP-date Retry-After falls back to exponential backoff
+                    delay = max(retry_after or 0, 2 ** attempt)
+                elif remaining == 0 and searching and reset:
+                    logger.warning(f"⚠️ GitHub search limit reached, pausing searches for {reset_wait:.0f}s (attempt {attempt + 1}/{GITHUB_RATE_LIMIT_RETRIES})")
+                    search_bucket(token).pause(reset_wait)
+                    continue
+                elif remaining == 0 and token and reset:
+                    logger.warning(f"⚠️ GitHub token exhausted, rotating it out for {reset_wait:.0f}s (attempt {attempt + 1}/{GITHUB_RATE_LIMIT_RETRIES})")
+                    self._github_tokens.cooldown(token, reset)
+                    continue
+                elif remaining == 0:
+                    delay = max(reset_wait, 2 ** attempt)
+                else:
+                    return response
+                logger.warning(f"⚠️ GitHub rate limit hit, retrying in {delay:.0f}s (attempt {attempt + 1}/{GITHUB_RATE_LIMIT_RETRIES})")
+                _flush_log()  # Say why the run is pausing before it does
+                time.sleep(delay)
+                continue
+            
+            if remaining is not None and remaining < GITHUB_RATE_LIMIT_FLOOR and reset_wait:
+                if searching:
+                    logger.info(f"📊 Only {remaining} GitHub searches left, pausing searches for {reset_wait:.0f}s")
+                    search_bucket(token).pause(reset_wait)
+                elif token:
+                    logger.warning(f"⚠️ Only {remaining} requests left on a GitHub token, resting it for {reset_wait:.0f}s")
+                    self._github_tokens.cooldown(token, reset)
+                else:
+                    logger.warning(f"⚠️ Only {remaining} GitHub requests left, waiting {reset_wait:.0f}s for the limit to reset")
+                    _flush_log()
+                    time.sleep(reset_wait)
+            
+            return response
+    
+    def _fetch_branch_prs(self, repo: str, branch: str, start_date: str, end_date: str) -> Tuple[List[Dict[str, Any]], bool]:
+        """Fetch PRs merged into a branch within the date range, returning them and whether the fetch finished."""
+        logger.info(f"🌿 Fetching PRs from {branch}...")
+        
+        fetched_at = datetime.now(timezone.utc)
+        track = self.use_cache and end_date >= fetched_at.strftime('%Y-%m-%d')
+        watermark = self._load_watermark(repo, branch) if track and not self.full_refresh else None
+        
+        kept = []
+        fetch_start = start_date
+        if watermark and watermark['start'] <= start_date:
+            since = (datetime.fromisoformat(watermark['fetched_at']) - WATERMARK_OVERLAP).strftime('%Y-%m-%d')
+            if since > start_date:
+                # Merge dates never change, so PRs merged before the overlap are still right
+                kept = [pr for pr in watermark['prs'] if start_date <= (pr.get('merged_at') or '')[:10] < since]
+                fetch_start = since
+                logger.info(f"♻️ Reusing {len(kept)} PRs on {branch} merged before {since}, fetching newer ones")
+        
+        prs = self._search_branch_prs(repo, branch, fetch_start, end_date)
+        complete = prs is not None
+        if prs is None:
+            logger.info(f"🔄 Scanning closed PRs on {branch} instead...")
+            prs, complete = self._list_branch_prs(repo, branch, fetch_start, end_date)
+        
+        prs = kept + prs
+        if track and complete:
+            self._save_watermark(repo, branch, start_date, fetched_at, prs)
+        
+        return prs, complete
+    
+    def _watermark_path(self, repo: str, branch: str) -> str:
+        """Get the file holding a branch's watermark and the PRs fetched up to it."""
+        key = hashlib.sha256(f"{repo}|{branch}".encode('utf-8')).hexdigest()
+        return os.path.join(GITHUB_CACHE_DIR, f"watermark_{key}.json")
+    
+    def _load_watermark(self, repo: str, branch: str) -> Optional[Dict[str, Any]]:
+        """Load a branch's watermark, if a previous run saved one."""
+        try:
+            with open(self._watermark_path(repo, branch), 'rb') as f:
+                return json_loads(f.read())
+        except (OSError, ValueError):
+            return None
+    
+    def _save_watermark(self, repo: str, branch: str, start_date: str, fetched_at: datetime,
+                        prs: List[Dict[str, Any]]) -> None:
+        """Save the PRs merged into a branch from start_date up to fetched_at."""
+        watermark = {'start': start_date, 'fetched_at': fetched_at.isoformat(), 'prs': prs}
+        write_cache_file(self._watermark_path(repo, branch), json_dumps(watermark))
+    
+    def _search_branch_prs(self, repo: str, branch: str, start_date: str, end_date: str) -> Optional[List[Dict[str, Any]]]:
+        """Fetch merged PRs with the Search API, or None if it can't answer the query completely."""
+        params = {
+            'q': f"repo:{repo} is:pr is:merged base:{branch} merged:{start_date}..{end_date}",
+            'per_page': GITHUB_PER_PAGE
+        }
+        
+        def fetch_page(page: int) -> Tuple[Optional[int], bool, List[Dict[str, Any]]]:
+            # Prune in the worker so each raw page can be freed as soon as it's parsed
+            data = self._github_get(GITHUB_SEARCH_URL, {**params, 'page': page})
+            page_prs = []
+            for item in data.get('items', []):
+                # Search results are issues; take merge info and commits URL from the PR side
+                item['merged_at'] = (item.get('pull_request') or {}).get('merged_at') or item.get('closed_at')
+                item['commits_url'] = f"https://api.github.com/repos/{repo}/pulls/{item['number']}/commits"
+                page_prs.append(self._prune_pr(item, branch))
+            return data.get('total_count'), bool(data.get('incomplete_results')), page_prs
+        
+        try:
+            total_count, incomplete, prs = fetch_page(1)
+            if total_count is None or incomplete:
+                return None
+            if total_count > GITHUB_SEARCH_MAX_RESULTS:
+                logger.warning(f"⚠️ {total_count} PRs on {branch} exceed the Search API limit of {GITHUB_SEARCH_MAX_RESULTS}")
+                return None
+            
+            # total_count tells us every page up front, so fetch the rest concurrently
+            last_page = -(-total_count // GITHUB_PER_PAGE)
+            with _worker_pool(GITHUB_PAGE_WAVE) as executor:
+                for _, incomplete, page_prs in executor.map(fetch_page, range(2, last_page + 1)):
+                    if incomplete:
+                        return None
+                    prs.extend(page_prs)
+        except _requests().RequestException as e:
+            logger.warning(f"⚠️ Search API request failed for {branch}: {e}")
+            return None
+        
+        return prs
+    
+    def _list_branch_prs(self, repo: str, branch: str, start_date: str, end_date: str) -> Tuple[List[Dict[str, Any]], bool]:
+        """Scan a branch's closed PRs for merges in the date range, returning them and whether the scan finished."""
+        url = f"https://api.github.com/repos/{repo}/pulls"
+        params = {
+            'state': 'closed',
+            'base': branch,
+            'sort': 'updated',
+            'direction': 'desc',
+            'per_page': GITHUB_PER_PAGE
+        }
+        
+        # GitHub timestamps are fixed-format UTC ('2024-01-31T12:00:00Z'), so the
+        # window bounds are rendered once in that format and compared as strings
+        start_ts = f"{start_date}T00:00:00Z"
+        end_ts = f"{datetime.fromisoformat(end_date).date() + timedelta(days=1)}T00:00:00Z"
+        # A PR can't be merged after its last update; allow a day of slack anyway
+        stale_ts = f"{datetime.fromisoformat(start_date).date() - timedelta(days=1)}T00:00:00Z"
+        
+        def fetch_page(page: int) -> Tuple[bool, List[Dict[str, Any]]]:
+            # Filter and prune in the worker so each raw page can be freed as soon as it's parsed
+            page_prs = self._github_get(url, {**params, 'page': page})
+            is_last = (
+                len(page_prs) < GITHUB_PER_PAGE
+                or min(pr.get('updated_at') or '' for pr in page_prs) < stale_ts
+            )
+            return is_last, self._filter_prs_by_date(page_prs, start_ts, end_ts, branch)
+        
+        prs = []
+        next_page = 1
+        wave_size = 1
+        
+        with _worker_pool(GITHUB_PAGE_WAVE) as executor:
+            while True:
+                try:
+                    pages = list(executor.map(fetch_page, range(next_page, next_page + wave_size)))
+                except _requests().RequestException as e:
+                    logger.error(f"❌ Error fetching PRs for {branch}: {e}")
+                    return prs, False
                 
-                # Filter by merge date and add branch info
-                for pr in page_prs:
-                    if pr.get('merged_at'):
-                        merged_date = datetime.fromisoformat(pr['merged_at'].replace('Z', '+00:00'))
-                        start_dt = datetime.fromisoformat(start_date).replace(tzinfo=timezone.utc)
-                        end_dt = datetime.fromisoformat(end_date).replace(tzinfo=timezone.utc)
-                        
-                        if start_dt <= merged_date <= end_dt:
-                            pr['base_branch'] = branch
-                            prs.append(pr)
+                last_page_reached = False
+                for is_last, page_prs in pages:
+                    prs.extend(page_prs)
+                    if is_last:
+                        last_page_reached = True
+                        break
                 
-                if len(page_prs) < per_page:
+                if last_page_reached:
                     break
-                page += 1
-                
-            except requests.exceptions.RequestException as e:
-                print(f"❌ Error fetching PRs for {branch}: {e}")
-                break
+                next_page += wave_size
+                wave_size = GITHUB_PAGE_WAVE
         
-        return prs
+        return prs, True
+    
+    def _fetch_pr_stats(self, repo: str, prs: List[Dict[str, Any]]) -> bool:
+        """Fill in additions, deletions, changed files and commit counts via batched GraphQL queries, returning whether all were fetched."""
+        if not prs or not self.github_token:
+            return True
+        
+        batches = [prs[i:i + GITHUB_GRAPHQL_BATCH] for i in range(0, len(prs), GITHUB_GRAPHQL_BATCH)]
+        
+        def fetch_batch(batch: List[Dict[str, Any]]) -> Dict[str, Any]:
+            return self._github_graphql(repo, " ".join(
+                f"pr{pr['number']}: pullRequest(number: {pr['number']}) {{ {_PR_STATS_FIELDS} }}"
+                for pr in batch
+            ))
+        
+        prs_by_number = {pr['number']: pr for pr in prs}
+        try:
+            with _worker_pool(max(1, min(GITHUB_MAX_WORKERS, len(batches)))) as executor:
+                results = list(executor.map(fetch_batch, batches))
+        except _requests().RequestException as e:
+            logger.warning(f"⚠️ Could not fetch PR statistics: {e}")
+            return False
+        
+        complete = True
+        for result in results:
+            if result.get('errors'):
+                logger.warning(f"⚠️ GraphQL errors fetching PR statistics: {result['errors'][0].get('message')}")
+                complete = False
+            data = result.get('data') or {}
+            for node in (data.get('repository') or {}).values():
+                pr = node and prs_by_number.get(node['number'])
+                if pr:
+                    pr['additions'] = node['additions']
+                    pr['deletions'] = node['deletions']
+                    pr['changed_files'] = node['changedFiles']
+                    pr['commits'] = node['commits']['totalCount']
+        
+        return complete
+    
+    def _github_graphql(self, repo: str, selections: str) -> Dict[str, Any]:
+        """Run a GraphQL query of aliased selections on a repository, warning when the point budget runs low."""
+        owner, name = repo.split('/', 1)
+        query = (
+            "query($owner: String!, $name: String!) { "
+            f"repository(owner: $owner, name: $name) {{ {selections} }} "
+            "rateLimit { cost remaining resetAt } }"
+        )
+        payload = {"query": query, "variables": {"owner": owner, "name": name}}
+        _, response = self._send_github(GITHUB_GRAPHQL_URL, self.github_headers, json=payload)
+        response.raise_for_status()
+        result = json_loads(response.content)
+        
+        rate_limit = (result.get('data') or {}).get('rateLimit')
+        if rate_limit and rate_limit['remaining'] < GITHUB_GRAPHQL_LOW_POINTS:
+            logger.warning(f"⚠️ GitHub GraphQL budget low: {rate_limit['remaining']} points left until {rate_limit['resetAt']}")
+        
+        return result
+    
+    def _validate_branches(self, repo: str, branches: List[str]) -> List[str]:
+        """Drop branches that don't exist (checked in one GraphQL query), or return them unchanged if the check fails."""
+        if not branches or not self.github_token:
+            return branches
+        
+        try:
+            result = self._github_graphql(repo, " ".join(
+                f"b{i}: ref(qualifiedName: {json.dumps('refs/heads/' + branch)}) {{ name }}"
+                for i, branch in enumerate(branches)
+            ))
+        except _requests().RequestException as e:
+            logger.warning(f"⚠️ Could not validate branches: {e}")
+            return branches
+        
+        refs = (result.get('data') or {}).get('repository')
+        if refs is None:
+            return branches
+        
+        valid_branches = {branch for i, branch in enumerate(branches) if refs.get(f"b{i}")}
+        missing = [branch for branch in branches if branch not in valid_branches]
+        if missing:
+            logger.warning(f"⚠️ Skipping branches not found in {repo}: {', '.join(missing)}")
+        
+        return [branch for branch in branches if branch in valid_branches]
     
-    def _filter_prs_by_date(self, prs: List[Dict[str, Any]], start_date: str, end_date: str, branch: str) -> List[Dict[str, Any]]:
-        """Filter PRs by merge date and add branch info."""
+    def _filter_prs_by_date(self, prs: List[Dict[str, Any]], start_ts: str, end_ts: str, branch: str) -> List[Dict[str, Any]]:
+        """Filter PRs merged in [start_ts, end_ts) and add branch info."""
         filtered_prs = []
-        start_dt = datetime.fromisoformat(start_date).replace(tzinfo=timezone.utc)
-        end_dt = datetime.fromisoformat(end_date).replace(tzinfo=timezone.utc)
         
         for pr in prs:
-            if pr.get('merged_at'):
-                merged_date = datetime.fromisoformat(pr['merged_at'].replace('Z', '+00:00'))
-                if start_dt <= merged_date <= end_dt:
-                    pr['base_branch'] = branch
-                    filtered_prs.append(pr)
+            merged_at = pr.get('merged_at')
+            if merged_at and start_ts <= merged_at < end_ts:
+                filtered_prs.append(self._prune_pr(pr, branch))
         
         return filtered_prs
+    
+    def _prune_pr(self, pr: Dict[str, Any], branch: str) -> Dict[str, Any]:
+        """Keep only the PR fields used downstream and tag the base branch."""
+        pruned = {k: pr[k] for k in _PR_KEEP if k in pr}
+        user = pruned.get('user')
+        if isinstance(user, dict):
+            pruned['user'] = {'login': user.get('login', 'unknown')}
+        pruned['base_branch'] = branch
+        return pruned
 
     def _extract_linear_id(self, pr: Dict[str, Any]) -> Optional[str]:
         """Extract Linear ID from PR title or body."""
@@ -265,39 +990,42 @@ class GitHubPRAnalyzer:
         commits_url = pr.get('commits_url', '')
         if commits_url and self.github_token:
             try:
-                response = requests.get(commits_url, headers=self.github_headers)
-                if response.status_code == 200:
-                    commits = response.json()
-                    for commit in commits:
-                        commit_message = commit.get('commit', {}).get('message', '') or ''
-                        linear_match = re.search(r'([A-Z]+-\d+)', commit_message)
-                        if linear_match:
-                            return linear_match.group(1)
+                commits = self._github_get(commits_url, ttl=GITHUB_DETAIL_TTL)
+                for commit in commits:
+                    commit_message = commit.get('commit', {}).get('message', '') or ''
+                    linear_match = re.search(r'([A-Z]+-\d+)', commit_message)
+                    if linear_match:
+                        return linear_match.group(1)
             except:
                 pass
         
         return None
     
-    def _fetch_linear_details(self, linear_id: str) -> Optional[Dict[str, Any]]:
-        """Fetch Linear details for a given Linear ID."""
+    def _fetch_linear_details(self, linear_id: str, refresh: bool = False) -> Optional[Dict[str, Any]]:
+        """Fetch Linear details for a given Linear ID, reusing results for LINEAR_CACHE_TTL seconds."""
         if not self.linear_headers:
             return None
         
+        cached = self._linear_cache.get(linear_id)
+        if cached and not refresh and cached[0] > time.monotonic():
+            return cached[1]
+        
         try:
             payload = {
                 "query": LINEAR_QUERY,
                 "variables": {"id": linear_id}
             }
             
-            response = requests.post(LINEAR_API_BASE, headers=self.linear_headers, json=payload)
+            response = self.session.post(LINEAR_API_BASE, headers=self.linear_headers, json=payload)
             response.raise_for_status()
             
-            data = response.json()
-            if 'data' in data and data['data'] and data['data'].get('issue'):
-                return data['data']['issue']
+            data = json_loads(response.content)
+            issue = (data.get('data') or {}).get('issue')
+            self._linear_cache[linear_id] = (time.monotonic() + LINEAR_CACHE_TTL, issue)
+            return issue
             
         except Exception as e:
-            print(f"❌ Error fetching Linear details for {linear_id}: {e}")
+            logger.error(f"❌ Error fetching Linear details for {linear_id}: {e}")
         
         return None
     
@@ -323,7 +1051,7 @@ class GitHubPRAnalyzer:
             priority = linear_details.get('priority', '') or ''
             if priority:
                 insights['priority_distribution'][priority] = insights['priority_distribution'].get(priority, 0) + 1
-                if priority in ['Urgent', 'High']:
+                if priority in _HIGH_PRIORITIES:
                     insights['high_priority_items'].append({
                         'id': linear_details.get('id'),
                         'title': linear_details.get('title', '') or '',
@@ -356,8 +1084,9 @@ class GitHubPRAnalyzer:
         
         return insights
 
-    def _save_raw_data(self, prs: List[Dict[str, Any]], repo: str, time_range: str, start_date: str, end_date: str) -> None:
-        """Save raw GitHub data to JSON file."""
+    def _save_raw_data(self, prs: List[Dict[str, Any]], repo: str, time_range: str, start_date: str, end_date: str,
+                       fetched_at: Optional[str] = None) -> None:
+        """Save raw GitHub data to JSON file, stamped with when it was fetched (this run by default)."""
         try:
             # Create metadata
             metadata = {
@@ -365,7 +1094,7 @@ class GitHubPRAnalyzer:
                 "time_range": time_range,
                 "start_date": start_date,
                 "end_date": end_date,
-                "fetch_timestamp": datetime.now().isoformat(),
+                "fetch_timestamp": fetched_at or _run_started().isoformat(),
                 "total_prs": len(prs),
                 "branches_analyzed": list(set(pr.get('base_branch', 'unknown') for pr in prs)),
                 "statistics": self._extract_statistics(prs)
@@ -378,17 +1107,16 @@ class GitHubPRAnalyzer:
             }
             
             # Generate filename with timestamp
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            filename = f"raw_github_data_{repo.replace('/', '_')}_{time_range}_{timestamp}.json"
+            filename = f"raw_github_data_{repo.replace('/', '_')}_{time_range}_{_run_file_timestamp()}.json"
             
             # Save to file
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(raw_data, f, indent=2, ensure_ascii=False, default=str)
+            with open(filename, 'wb') as f:
+                f.write(json_dumps(raw_data, indent=True))
             
-            print(f"💾 Raw GitHub data saved to: {filename}")
+            logger.info(f"💾 Raw GitHub data saved to: {filename}")
             
         except Exception as e:
-            print(f"⚠️ Warning: Failed to save raw data: {e}")
+            logger.warning(f"⚠️ Warning: Failed to save raw data: {e}")
     
     def _extract_statistics(self, prs: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Extract useful statistics from PR data."""
@@ -443,37 +1171,23 @@ class GitHubPRAnalyzer:
             }
         }
     
-    def _format_summary_with_links(self, summary: str, prs: List[Dict[str, Any]], repo: str) -> str:
-        """Format summary with PR links instead of commit details."""
-        # Extract PR numbers from summary
-        pr_numbers = re.findall(r'#(\d+)', summary)
-        
-        # Create PR links (just PR numbers as custom links)
-        pr_links = []
-        for pr_num in pr_numbers:
-            pr_link = f"<https://github.com/{repo}/pull/{pr_num}|#{pr_num}>"
-            pr_links.append(pr_link)
-        
-        # Replace PR numbers with links
-        formatted_summary = summary
-        for i, pr_num in enumerate(pr_numbers):
-            if i < len(pr_links):
-                formatted_summary = formatted_summary.replace(f"#{pr_num}", pr_links[i])
-        
-        return formatted_summary
+    def _format_summary_with_links(self, summary: str, prs: List[Dict[str, Any]], repo: str) -> Tuple[str, int]:
+        """Link the fetched PRs a summary mentions and count the unique PR numbers in it."""
+        pr_urls = {str(pr['number']): f"https://github.com/{repo}/pull/{pr['number']}" for pr in prs}
+        seen = set()
+        
+        def _link(match: re.Match) -> str:
+            pr_num = match.group(1)
+            seen.add(pr_num)
+            url = pr_urls.get(pr_num)
+            return f"<{url}|#{pr_num}>" if url else match.group(0)
+        
+        formatted_summary = _PR_NUM_RE.sub(_link, summary)
+        return formatted_summary, len(seen)
 
     def create_summary_prompt(self, prs: List[Dict[str, Any]], time_range: str) -> str:
         """Create an exciting weekly digest prompt."""
-        
-        # Group by branch
-        grouped = {}
-        for pr in prs:
-            branch = pr.get('base_branch', 'unknown')
-            if branch not in grouped:
-                grouped[branch] = []
-            grouped[branch].append(pr)
-        
-        prompt = f"""Create an exciting weekly digest of {len(prs)} Pull Requests that shipped to production! 🚀
+        parts = [f"""Create an exciting weekly digest of {len(prs)} Pull Requests that shipped to production! 🚀
 
 This is our weekly development roundup - make it engaging and fun to read while highlighting the impact.
 
@@ -509,38 +1223,28 @@ Technical Enhancement Tips:
 - Reference infrastructure improvements, deployment optimizations, or CI/CD changes
 
 PR Details:
-"""
+"""]
         
-        for branch, branch_prs in grouped.items():
-            prompt += f"\n## {branch.upper()} ({len(branch_prs)} PRs)\n"
+        for branch, branch_prs in _group_by_branch(prs).items():
+            parts.append(f"\n## {branch.upper()} ({len(branch_prs)} PRs)\n")
             for pr in branch_prs[:8]:  # Top 8 per branch for better categorization
-                author = pr.get('user', {}).get('login', 'unknown') if isinstance(pr.get('user'), dict) else 'unknown'
-                prompt += f"- #{pr['number']}: {pr['title']} (by {author})\n"
+                parts.append(f"- #{pr['number']}: {pr['title']} (by {self._get_pr_author(pr)})\n")
             
             if len(branch_prs) > 8:
-                prompt += f"- ... and {len(branch_prs) - 8} more\n"
+                parts.append(f"- ... and {len(branch_prs) - 8} more\n")
         
-        prompt += """
+        parts.append("""
 
 Analyze the PR titles and descriptions to categorize them properly. Focus on what each change means for users and the business. Create an exciting digest that celebrates our team's achievements!
-"""
-        return prompt
-    
-    def _group_prs_by_branch(self, prs: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
-        """Group PRs by branch."""
-        grouped = {}
-        for pr in prs:
-            branch = pr.get('base_branch', 'unknown')
-            if branch not in grouped:
-                grouped[branch] = []
-            grouped[branch].append(pr)
-        return grouped
+""")
+        return "".join(parts)
     
     def _get_pr_author(self, pr: Dict[str, Any]) -> str:
-        """Get PR author name."""
-        if pr.get('user') and isinstance(pr['user'], dict):
-            return pr['user'].get('login', 'unknown')
-        return 'unknown'
+        """Get PR author name, using the one fetch_prs resolved when present."""
+        if '_author' in pr:
+            return pr['_author']
+        user = pr.get('user')
+        return user.get('login', 'unknown') if isinstance(user, dict) else 'unknown'
 
     def _estimate_prompt_tokens(self, prompt: str) -> int:
         """Estimate token count for prompt."""
@@ -551,96 +1255,103 @@ Analyze the PR titles and descriptions to categorize them properly. Focus on wha
         estimated_tokens = self._estimate_prompt_tokens(prompt)
         return estimated_tokens > 8000 or len(prs) > 50
     
-    def _prepare_data_for_chunked_summarization(self, prs: List[Dict[str, Any]], time_range: str) -> str:
-        """Prepare data for chunked summarization."""
-        text_content = f"# Development Summary - Last {time_range}\n\n"
-        text_content += f"Total PRs: {len(prs)}\n\n"
-        
-        # Group by branch
-        grouped = self._group_prs_by_branch(prs)
+    def _prepare_data_for_chunked_summarization(self, prs: List[Dict[str, Any]], time_range: str) -> List[str]:
+        """Split PRs into chunks of PRS_PER_CHUNK per branch, trimming descriptions to a shared token budget."""
+        chunks = []
+        body_tokens = min(PR_BODY_MAX_TOKENS, PR_BODY_TOKEN_BUDGET // max(1, len(prs)))
+        
+        for branch, branch_prs in _group_by_branch(prs).items():
+            total_parts = -(-len(branch_prs) // PRS_PER_CHUNK)
+            for part, i in enumerate(range(0, len(branch_prs), PRS_PER_CHUNK), 1):
+                parts = [
+                    f"# Development Summary - Last {time_range}\n\n",
+                    f"## {branch.upper()} Branch ({len(branch_prs)} PRs, part {part} of {total_parts})\n\n"
+                ]
+                for pr in branch_prs[i:i + PRS_PER_CHUNK]:
+                    parts.append(self._format_pr_for_chunk(pr, body_tokens))
+                    parts.append("\n---\n\n")
+                chunks.append("".join(parts))
         
-        for branch, branch_prs in grouped.items():
-            text_content += f"## {branch.upper()} Branch ({len(branch_prs)} PRs)\n\n"
+        return chunks
+    
+    def _format_pr_for_chunk(self, pr: Dict[str, Any], body_tokens: int = PR_BODY_MAX_TOKENS) -> str:
+        """Format one PR, with its Linear context, for chunked summarization."""
+        parts = []
+        parts.append(f"### PR #{pr['number']}: {pr['title']}\n")
+        parts.append(f"**Author**: {self._get_pr_author(pr)}\n")
+        parts.append(f"**Merged**: {pr.get('merged_at', 'Unknown')}\n")
+        parts.append(f"**URL**: {pr.get('html_url', 'Unknown')}\n")
+        
+        # Add PR body if available, trimmed to its share of the token budget
+        body = pr.get('body', '') or ''
+        if body and body_tokens > 0:
+            parts.append(f"**Description**: {_truncate_tokens(body, body_tokens)}\n")
+        
+        # Add Linear details if available
+        linear_details = pr.get('linear_details')
+        if linear_details:
+            # Basic Linear info
+            linear_title = linear_details.get('title', '') or ''
+            linear_description = linear_details.get('description', '') or ''
+            linear_state_obj = linear_details.get('state', {}) or {}
+            linear_state = linear_state_obj.get('name', '') or '' if linear_state_obj and isinstance(linear_state_obj, dict) else ''
+            linear_priority = linear_details.get('priority', '') or ''
             
-            for pr in branch_prs:
-                author = self._get_pr_author(pr)
-                text_content += f"### PR #{pr['number']}: {pr['title']}\n"
-                text_content += f"**Author**: {author}\n"
-                text_content += f"**Merged**: {pr.get('merged_at', 'Unknown')}\n"
-                text_content += f"**URL**: {pr.get('html_url', 'Unknown')}\n"
-                
-                # Add PR body if available
-                body = pr.get('body', '') or ''
-                if body:
-                    text_content += f"**Description**: {body[:500]}{'...' if len(body) > 500 else ''}\n"
-                
-                # Add Linear details if available
-                linear_details = pr.get('linear_details')
-                if linear_details:
-                    # Basic Linear info
-                    linear_title = linear_details.get('title', '') or ''
-                    linear_description = linear_details.get('description', '') or ''
-                    linear_state_obj = linear_details.get('state', {}) or {}
-                    linear_state = linear_state_obj.get('name', '') or '' if linear_state_obj and isinstance(linear_state_obj, dict) else ''
-                    linear_priority = linear_details.get('priority', '') or ''
-                    
-                    # Get labels safely
-                    linear_labels = []
-                    labels_obj = linear_details.get('labels', {}) or {}
-                    if labels_obj and isinstance(labels_obj, dict):
-                        label_nodes = labels_obj.get('nodes', []) or []
-                        for label in label_nodes:
-                            if label and isinstance(label, dict):
-                                label_name = label.get('name', '') or ''
-                                if label_name:
-                                    linear_labels.append(label_name)
-                    
-                    # Enhanced Linear context
-                    linear_assignee = linear_details.get('assignee', {}) or {}
-                    linear_project = linear_details.get('project', {}) or {}
-                    linear_team = linear_details.get('team', {}) or {}
-                    linear_cycle = linear_details.get('cycle', {}) or {}
-                    linear_comments_obj = linear_details.get('comments', {}) or {}
-                    linear_comments = linear_comments_obj.get('nodes', []) or [] if linear_comments_obj and isinstance(linear_comments_obj, dict) else []
-                    
-                    if linear_title and linear_title != pr['title']:
-                        text_content += f"**Linear Issue**: {linear_title}\n"
-                    if linear_description:
-                        desc_preview = linear_description[:500] + "..." if len(linear_description) > 500 else linear_description
-                        text_content += f"**Linear Description**: {desc_preview}\n"
-                    if linear_state:
-                        text_content += f"**Linear Status**: {linear_state}\n"
-                    if linear_priority:
-                        text_content += f"**Linear Priority**: {linear_priority}\n"
-                    if linear_labels:
-                        text_content += f"**Linear Labels**: {', '.join(linear_labels)}\n"
-                    if linear_assignee and isinstance(linear_assignee, dict) and linear_assignee.get('name'):
-                        text_content += f"**Linear Assignee**: {linear_assignee['name']}\n"
-                    if linear_project and isinstance(linear_project, dict) and linear_project.get('name'):
-                        text_content += f"**Linear Project**: {linear_project['name']}\n"
-                        if linear_project.get('description'):
-                            proj_desc = linear_project['description'][:200] + "..." if len(linear_project['description']) > 200 else linear_project['description']
-                            text_content += f"**Project Description**: {proj_desc}\n"
-                    if linear_team and isinstance(linear_team, dict) and linear_team.get('name'):
-                        text_content += f"**Linear Team**: {linear_team['name']} ({linear_team.get('key', '')})\n"
-                    if linear_cycle and isinstance(linear_cycle, dict) and linear_cycle.get('name'):
-                        text_content += f"**Linear Cycle**: {linear_cycle['name']} (#{linear_cycle.get('number', '')})\n"
-                    
-                    # Include recent comments for context
-                    if linear_comments:
-                        text_content += f"**Linear Comments**:\n"
-                        for comment in linear_comments[-3:]:  # Last 3 comments
-                            if comment and isinstance(comment, dict):
-                                comment_body = comment.get('body', '') or ''
-                                comment_user_obj = comment.get('user', {}) or {}
-                                comment_user = comment_user_obj.get('name', 'Unknown') if comment_user_obj and isinstance(comment_user_obj, dict) else 'Unknown'
-                                if comment_body:
-                                    comment_preview = comment_body[:150] + "..." if len(comment_body) > 150 else comment_body
-                                    text_content += f"  - {comment_user}: {comment_preview}\n"
-                
-                text_content += "\n---\n\n"
-        
-        return text_content
+            # Get labels safely
+            linear_labels = []
+            labels_obj = linear_details.get('labels', {}) or {}
+            if labels_obj and isinstance(labels_obj, dict):
+                label_nodes = labels_obj.get('nodes', []) or []
+                for label in label_nodes:
+                    if label and isinstance(label, dict):
+                        label_name = label.get('name', '') or ''
+                        if label_name:
+                            linear_labels.append(label_name)
+            
+            # Enhanced Linear context
+            linear_assignee = linear_details.get('assignee', {}) or {}
+            linear_project = linear_details.get('project', {}) or {}
+            linear_team = linear_details.get('team', {}) or {}
+            linear_cycle = linear_details.get('cycle', {}) or {}
+            linear_comments_obj = linear_details.get('comments', {}) or {}
+            linear_comments = linear_comments_obj.get('nodes', []) or [] if linear_comments_obj and isinstance(linear_comments_obj, dict) else []
+            
+            if linear_title and linear_title != pr['title']:
+                parts.append(f"**Linear Issue**: {linear_title}\n")
+            if linear_description:
+                desc_preview = linear_description[:500] + "..." if len(linear_description) > 500 else linear_description
+                parts.append(f"**Linear Description**: {desc_preview}\n")
+            if linear_state:
+                parts.append(f"**Linear Status**: {linear_state}\n")
+            if linear_priority:
+                parts.append(f"**Linear Priority**: {linear_priority}\n")
+            if linear_labels:
+                parts.append(f"**Linear Labels**: {', '.join(linear_labels)}\n")
+            if linear_assignee and isinstance(linear_assignee, dict) and linear_assignee.get('name'):
+                parts.append(f"**Linear Assignee**: {linear_assignee['name']}\n")
+            if linear_project and isinstance(linear_project, dict) and linear_project.get('name'):
+                parts.append(f"**Linear Project**: {linear_project['name']}\n")
+                if linear_project.get('description'):
+                    proj_desc = linear_project['description'][:200] + "..." if len(linear_project['description']) > 200 else linear_project['description']
+                    parts.append(f"**Project Description**: {proj_desc}\n")
+            if linear_team and isinstance(linear_team, dict) and linear_team.get('name'):
+                parts.append(f"**Linear Team**: {linear_team['name']} ({linear_team.get('key', '')})\n")
+            if linear_cycle and isinstance(linear_cycle, dict) and linear_cycle.get('name'):
+                parts.append(f"**Linear Cycle**: {linear_cycle['name']} (#{linear_cycle.get('number', '')})\n")
+            
+            # Include recent comments for context
+            if linear_comments:
+                parts.append(f"**Linear Comments**:\n")
+                for comment in linear_comments[-3:]:  # Last 3 comments
+                    if comment and isinstance(comment, dict):
+                        comment_body = comment.get('body', '') or ''
+                        comment_user_obj = comment.get('user', {}) or {}
+                        comment_user = comment_user_obj.get('name', 'Unknown') if comment_user_obj and isinstance(comment_user_obj, dict) else 'Unknown'
+                        if comment_body:
+                            comment_preview = comment_body[:150] + "..." if len(comment_body) > 150 else comment_body
+                            parts.append(f"  - {comment_user}: {comment_preview}\n")
+        
+        return "".join(parts)
     
     def generate_beautiful_summary(self, prs: List[Dict[str, Any]], time_range: str) -> str:
         """Generate beautiful markdown summary using LLM."""
@@ -656,51 +1367,83 @@ Analyze the PR titles and descriptions to categorize them properly. Focus on wha
         # Create prompt
         prompt = self.create_summary_prompt(prs, time_range)
         
-        # Check if we should use chunked summarization
-        if self._should_use_chunked_summarization(prs, prompt):
-            print("🔄 Using chunked summarization for large dataset...")
-            return self._generate_chunked_summary(prs, time_range, linear_insights)
-        else:
-            print("🔄 Using standard summarization...")
-            return self._generate_standard_summary(prompt)
+        chunked = self._should_use_chunked_summarization(prs, prompt)
+        
+        # Summaries are keyed on the whole LLM input. The chunked path reads every PR
+        # body and Linear details, not just the prompt, so they are all part of the
+        # key (PR URLs identify the repo).
+        llm_input = [
+            chunked, time_range, prompt,
+            [[pr.get('number'), pr.get('html_url'), pr.get('title'), pr.get('body'),
+              pr.get('base_branch'), pr.get('linear_details')] for pr in prs]
+        ]
+        key = hashlib.sha256(json_dumps(llm_input, sort_keys=True)).hexdigest()
+        
+        # Reuse a summary generated from the same LLM input within the last hour. The
+        # LLM isn't deterministic, so this trades a fresh wording for no token spend.
+        summary_file = None
+        if self.use_cache:
+            summary_file = os.path.join(GITHUB_CACHE_DIR, f"summary_{key}.md")
+            cached = read_fresh_file(summary_file, DIGEST_CACHE_TTL)
+            if cached is not None:
+                logger.info("♻️ Reusing the summary generated for the same PRs within the last hour")
+                return cached.decode('utf-8')
+        
+        def generate() -> str:
+            if chunked:
+                logger.info("🔄 Using chunked summarization for large dataset...")
+                summary = self._generate_chunked_summary(prs, time_range, linear_insights)
+            else:
+                logger.info("🔄 Using standard summarization...")
+                summary = self._generate_standard_summary(prompt)
+            
+            if summary_file and not summary.startswith("# ❌"):
+                write_cache_file(summary_file, summary.encode('utf-8'))
+            
+            return summary
+        
+        # Concurrent calls with the same LLM input share one LLM pass
+        return _single_flight(('summary', key), generate)
     
     def _generate_chunked_summary(self, prs: List[Dict[str, Any]], time_range: str, linear_insights: Dict[str, Any]) -> str:
         """Generate summary using chunked approach for large datasets."""
         try:
-            # Prepare data for chunking
-            text_content = self._prepare_data_for_chunked_summarization(prs, time_range)
+            # Split PRs into per-branch chunks that are summarized concurrently
+            pr_chunks = self._prepare_data_for_chunked_summarization(prs, time_range)
             
             # Import chunked summarizer
             try:
                 from chunked_summarizer import ChunkedSummarizer
                 summarizer = ChunkedSummarizer(openai_key=self.openai_key)
                 
-                print("🔄 Using chunked summarization...")
-                summary = summarizer.summarize_text(
-                    text_content,
-                    output_format="markdown",
-                    max_words=300,
-                    include_metadata=True
-                )
+                logger.info(f"🔄 Using chunked summarization ({len(pr_chunks)} chunks of up to {PRS_PER_CHUNK} PRs)...")
+                _flush_log()  # ChunkedSummarizer prints its own progress
+                if len(pr_chunks) == 1:
+                    summary = summarizer.summarize_text(pr_chunks[0], max_words=300)
+                else:
+                    # A chunk with long descriptions can still exceed the token limit; split it further
+                    chunks = [piece for chunk in pr_chunks for piece in summarizer.tokenizer.split_into_chunks(chunk)]
+                    summary = summarizer.merge_summaries(summarizer.summarize_chunks(chunks))
                 
                 # Add Linear insights section
                 if linear_insights['total_linear_items'] > 0:
                     summary += "\n\n" + self._create_linear_insights_section(linear_insights)
                 
-                print("✅ Chunked summary generated successfully!")
+                logger.info("✅ Chunked summary generated successfully!")
                 return summary
                 
             except ImportError:
-                print("⚠️ Chunked summarizer not available, falling back to standard summary...")
+                logger.warning("⚠️ Chunked summarizer not available, falling back to standard summary...")
                 return self._generate_standard_summary(self.create_summary_prompt(prs, time_range))
             
         except Exception as e:
-            print(f"❌ Error in chunked summarization: {e}")
+            logger.error(f"❌ Error in chunked summarization: {e}")
             return self._generate_standard_summary(self.create_summary_prompt(prs, time_range))
     
     def _generate_standard_summary(self, prompt: str) -> str:
         """Generate standard summary using OpenAI."""
         try:
+            OPENAI_BUCKET.acquire()
             response = self.openai_client.chat.completions.create(
                 model="gpt-4o-mini",
                 messages=[
@@ -714,53 +1457,69 @@ Analyze the PR titles and descriptions to categorize them properly. Focus on wha
                     }
                 ],
                 temperature=0.3,
-                max_tokens=2000
+                max_tokens=2000,
+                stream=True
             )
             
-            summary = response.choices[0].message.content
-            print("✅ Standard summary generated successfully!")
+            # Collect the streamed deltas as they arrive, echoing them when streaming to the console
+            if self.stream_output:
+                _flush_log()
+                sys.stdout.write(f"\n{_BANNER}\n                    GITHUB PR SUMMARY\n{_BANNER}\n")
+            parts = []
+            for chunk in response:
+                if chunk.choices:
+                    delta = chunk.choices[0].delta.content or ""
+                    parts.append(delta)
+                    if self.stream_output:
+                        sys.stdout.write(delta)
+                        sys.stdout.flush()
+            if self.stream_output:
+                sys.stdout.write(f"\n{_BANNER}\n")
+                self.summary_streamed = True
+            
+            summary = "".join(parts)
+            logger.info("✅ Standard summary generated successfully!")
             return summary
             
         except Exception as e:
-            print(f"❌ Error generating summary: {e}")
+            logger.error(f"❌ Error generating summary: {e}")
             return f"# ❌ Summary Generation Failed\n\nError: {e}"
     
     def _create_linear_insights_section(self, linear_insights: Dict[str, Any]) -> str:
         """Create an exciting section for Linear insights."""
-        section = "## 🔗 Linear Integration Highlights\n\n"
-        
-        section += f"🎯 **Total Linear Items**: {linear_insights['total_linear_items']}\n"
+        parts = [
+            "## 🔗 Linear Integration Highlights\n\n",
+            f"🎯 **Total Linear Items**: {linear_insights['total_linear_items']}\n"
+        ]
         
         if linear_insights['high_priority_items']:
-            section += f"🔥 **High Priority Wins**: {len(linear_insights['high_priority_items'])} critical items completed!\n"
+            parts.append(f"🔥 **High Priority Wins**: {len(linear_insights['high_priority_items'])} critical items completed!\n")
         
         if linear_insights['priority_distribution']:
             priorities = [f"{k}: {v}" for k, v in linear_insights['priority_distribution'].items()]
-            section += f"📊 **Priority Breakdown**: {', '.join(priorities)}\n"
+            parts.append(f"📊 **Priority Breakdown**: {', '.join(priorities)}\n")
         
         if linear_insights['label_distribution']:
             top_labels = sorted(linear_insights['label_distribution'].items(), key=lambda x: x[1], reverse=True)[:5]
             labels = [f"{k} ({v})" for k, v in top_labels]
-            section += f"🏷️ **Top Labels**: {', '.join(labels)}\n"
+            parts.append(f"🏷️ **Top Labels**: {', '.join(labels)}\n")
         
-        return section
+        return "".join(parts)
 
     def save_summary(self, summary: str, output_file: str) -> None:
         """Save summary to markdown file."""
         try:
-            with open(output_file, 'w', encoding='utf-8') as f:
-                f.write(summary)
-            print(f"💾 Summary saved to: {output_file}")
+            data = summary.encode('utf-8')
+            with open(output_file, 'wb') as f:
+                f.write(data)
+            logger.info(f"💾 Summary saved to: {output_file}")
         except Exception as e:
-            print(f"❌ Error saving summary: {e}")
+            logger.error(f"❌ Error saving summary: {e}")
 
     def print_summary(self, summary: str) -> None:
         """Print summary to console."""
-        print("\n" + "🎉" + "="*78 + "🎉")
-        print("                    GITHUB PR SUMMARY")
-        print("🎉" + "="*78 + "🎉")
-        print(summary)
-        print("🎉" + "="*78 + "🎉")
+        _flush_log()
+        sys.stdout.write(f"\n{_BANNER}\n                    GITHUB PR SUMMARY\n{_BANNER}\n{summary}\n{_BANNER}\n")
 
 class SlackClient:
     """Handles Slack message sending with error handling and fallbacks."""
@@ -770,116 +1529,62 @@ class SlackClient:
         self.bot_token = bot_token or os.getenv('SLACK_BOT_TOKEN')
         self.channel_id = channel_id or os.getenv('SLACK_CHANNEL_ID')
         
+        self.headers = {
+            "Authorization": f"Bearer {self.bot_token}",
+            "Content-Type": "application/json"
+        }
+    
+    def _post(self, payload: Dict[str, Any]) -> 'requests.Response':
+        """POST a chat.postMessage payload over the shared Slack session."""
+        return _slack_session().post(SLACK_API_BASE, headers=self.headers, json=payload, timeout=SLACK_TIMEOUT)
+    
     def truncate_text(self, text: str, max_length: int = MAX_SLACK_TEXT_LENGTH) -> str:
         """Truncate text to fit Slack's limits."""
         if len(text) <= max_length:
             return text
         
-        # Try to truncate at a sentence boundary
-        truncated = text[:max_length-3]
-        last_period = truncated.rfind('.')
-        last_newline = truncated.rfind('\n')
-        last_break = max(last_period, last_newline)
+        # Try to truncate at a sentence boundary (searching in place, without a copy)
+        cap = max_length - 3
+        last_break = max(text.rfind('.', 0, cap), text.rfind('\n', 0, cap))
         
         if last_break > max_length * 0.8:  # If we can find a good break point
-            return truncated[:last_break+1] + "..."
-        else:
-            return truncated + "..."
+            return text[:last_break+1] + "..."
+        return text[:cap] + "..."
     
     def format_for_slack(self, markdown_text: str) -> str:
         """Convert markdown to Slack-friendly formatting."""
-        if not markdown_text:
-            return ""
-        
-        # Convert markdown to Slack formatting
-        formatted = markdown_text
-        
-        # Headers - use bold with emojis (convert to Slack bold format)
-        formatted = re.sub(r'^# (.+)$', r'*📊 \1*', formatted, flags=re.MULTILINE)
-        formatted = re.sub(r'^## (.+)$', r'*\1*', formatted, flags=re.MULTILINE)
-        formatted = re.sub(r'^### (.+)$', r'*\1*', formatted, flags=re.MULTILINE)
-        
-
-        
-        # Bold text - convert **text** to *text* (Slack uses * for bold)
-        formatted = re.sub(r'\*\*(.+?)\*\*', r'*\1*', formatted)
-        
-        # Italic text - convert *text* to _text_ (but not if it's already bold)
-        formatted = re.sub(r'(?<!\*)\*([^*]+?)\*(?!\*)', r'_\1_', formatted)
-        
-        # Code blocks
-        formatted = re.sub(r'```(.+?)```', r'`\1`', formatted, flags=re.DOTALL)
-        
-        # Inline code
-        formatted = re.sub(r'`(.+?)`', r'`\1`', formatted)
-        
-        # Lists - convert to bullet points
-        formatted = re.sub(r'^- (.+)$', r'• \1', formatted, flags=re.MULTILINE)
-        formatted = re.sub(r'^\d+\. (.+)$', r'• \1', formatted, flags=re.MULTILINE)
-        
-        # Links - convert markdown links to Slack format (but preserve existing custom links)
-        # First, temporarily replace existing custom links to protect them
-        custom_links = re.findall(r'<https://[^>]+>', formatted)
-        for i, link in enumerate(custom_links):
-            formatted = formatted.replace(link, f'__CUSTOM_LINK_{i}__')
-        
-        # Convert markdown links to Slack format
-        formatted = re.sub(r'\[([^\]]+)\]\(([^)]+)\)', r'<\2|\1>', formatted)
-        
-        # Restore custom links
-        for i, link in enumerate(custom_links):
-            formatted = formatted.replace(f'__CUSTOM_LINK_{i}__', link)
-        
-        # Clean up emoji codes and replace with actual emojis
-        formatted = re.sub(r':bar_chart:', '📊', formatted)
-        formatted = re.sub(r':date:', '📅', formatted)
-        formatted = re.sub(r':alarm_clock:', '⏰', formatted)
-        formatted = re.sub(r':rocket:', '🚀', formatted)
-        formatted = re.sub(r':zap:', '⚡', formatted)
-        formatted = re.sub(r':bug:', '🐛', formatted)
-        formatted = re.sub(r':wrench:', '🔧', formatted)
-        formatted = re.sub(r':busts_in_silhouette:', '👥', formatted)
-        formatted = re.sub(r':robot_face:', '🤖', formatted)
-        
-        # Remove extra newlines and clean up spacing
-        formatted = re.sub(r'\n{3,}', '\n\n', formatted)
-        formatted = re.sub(r'•\s*\n\s*•', '•', formatted)  # Fix bullet point spacing
-        
-        return formatted.strip()
+        return _format_for_slack(markdown_text)
     
     def create_slack_blocks(self, summary: str, pr_count: int, time_range: str, repo: str) -> List[Dict[str, Any]]:
         """Create properly formatted Slack blocks."""
         # Format the summary for Slack
         formatted_summary = self.format_for_slack(summary)
         
+        return self._build_slack_blocks(formatted_summary, pr_count, time_range, repo)
+    
+    def _build_slack_blocks(self, formatted_summary: str, pr_count: int, time_range: str, repo: str) -> List[Dict[str, Any]]:
+        """Create Slack blocks from an already Slack-formatted summary."""
         blocks = [
-            {
-                "type": "header",
-                "text": {
-                    "type": "plain_text",
-                    "text": f"🚀 Weekly Development Digest - {repo}",
-                    "emoji": True
-                }
-            },
-            {
-                "type": "context",
-                "elements": [
-                    {
-                        "type": "mrkdwn",
-                        "text": f"🎉 {pr_count} awesome changes shipped this week! | 📅 {time_range} | ⏰ {datetime.now().strftime('%Y-%m-%d %H:%M UTC')}"
-                    }
-                ]
-            },
-            {
-                "type": "divider"
-            }
+            _header_block(f"🚀 Weekly Development Digest - {repo}"),
+            _context_block(f"🎉 {pr_count} awesome changes shipped this week! | 📅 {time_range} | ⏰ {_run_timestamp()}"),
+            _DIVIDER
         ]
+        blocks.extend(self._summary_body_blocks(formatted_summary))
+        
+        # Add footer
+        blocks.extend(_SLACK_FOOTER_BLOCKS)
+        
+        return blocks
+    
+    def _summary_body_blocks(self, formatted_summary: str) -> List[Dict[str, Any]]:
+        """Create the header and section blocks for the body of a Slack-formatted summary."""
+        blocks = []
         
-        # Split the summary into sections and create blocks for each
-        sections = formatted_summary.split('\n\n')
-        current_section_text = ""
+        # Split the summary into sections and create blocks for each; body
+        # paragraphs are collected in a list and joined once per section
+        section_parts = []
         
-        for section in sections:
+        for section in formatted_summary.split('\n\n'):
             section = section.strip()
             if not section:
                 continue
@@ -887,82 +1592,31 @@ class SlackClient:
             # Check if this is a section header (more flexible matching)
             # Remove formatting and check for header content
             section_clean = section.replace('*', '').replace('#', '').strip()
-            if any(header in section_clean for header in [
-                "📊 This Week's Highlights",
-                "🚀 What's New", 
-                "⚡ Level Up",
-                "🐛 Bug Squashed",
-                "🔧 Behind the Scenes",
-                "👥 MVP Contributors"
-            ]):
+            if any(header in section_clean for header in _SLACK_SECTION_HEADERS):
                 # If we have accumulated text, add it as a section block
-                if current_section_text.strip():
-                    blocks.append({
-                        "type": "section",
-                        "text": {
-                            "type": "mrkdwn",
-                            "text": current_section_text.strip()
-                        }
-                    })
+                if section_parts:
+                    blocks.extend(_section_block(chunk) for chunk in _split_paragraphs("\n\n".join(section_parts)))
                     # Add spacing between sections
-                    blocks.append({"type": "divider"})
-                    current_section_text = ""
+                    blocks.append(_DIVIDER)
+                    section_parts = []
                 
                 # Add the section header as a header block (bigger and bold)
-                header_text = section.replace('*', '').replace('#', '').strip()  # Remove existing formatting
-                blocks.append({
-                    "type": "header",
-                    "text": {
-                        "type": "plain_text",
-                        "text": header_text,
-                        "emoji": True
-                    }
-                })
+                blocks.append(_header_block(section_clean))
             else:
                 # Accumulate text for the current section
-                if current_section_text:
-                    current_section_text += "\n\n" + section
-                else:
-                    current_section_text = section
+                section_parts.append(section)
         
         # Add any remaining text
-        if current_section_text.strip():
-            blocks.append({
-                "type": "section",
-                "text": {
-                    "type": "mrkdwn",
-                    "text": current_section_text.strip()
-                }
-            })
-        
-        # Add footer
-        blocks.extend([
-            {
-                "type": "divider"
-            },
-            {
-                "type": "context",
-                "elements": [
-                    {
-                        "type": "mrkdwn",
-                        "text": "🤖 Powered by GitHub PR Analyzer | 🎉 Keep building amazing things!"
-                    }
-                ]
-            }
-        ])
+        if section_parts:
+            blocks.extend(_section_block(chunk) for chunk in _split_paragraphs("\n\n".join(section_parts)))
         
         return blocks
     
-    def send_message(self, blocks: List[Dict[str, Any]]) -> bool:
-        """Send message to Slack using blocks format with fallback."""
+    def send_message(self, blocks: List[Dict[str, Any]], fallback_text: Optional[str] = None) -> bool:
+        """Send message to Slack using blocks format, falling back to fallback_text (or text from the blocks)."""
         if not self.bot_token or not self.channel_id:
-            print("❌ Slack bot token or channel ID not configured")
+            logger.error("❌ Slack bot token or channel ID not configured")
             return False
-            
-        headers = {
-            "Authorization": f"Bearer {self.bot_token}",
-            "Content-Type": "application/json"
-        }
         
         # Try blocks format first
         payload = {
@@ -971,25 +1625,27 @@ class SlackClient:
         }
         
         try:
-            response = requests.post(SLACK_API_BASE, headers=headers, json=payload)
+            response = self._post(payload)
             response.raise_for_status()
             
             result = response.json()
             if result.get('ok'):
-                print("✅ Message sent to Slack successfully!")
+                logger.info("✅ Message sent to Slack successfully!")
                 return True
             else:
                 error = result.get('error')
-                print(f"❌ Slack API error: {error}")
+                logger.error(f"❌ Slack API error: {error}")
                 
                 # If blocks format failed, try simple text format
                 if error == "invalid_blocks":
-                    print("🔄 Trying fallback text format...")
-                    return self.send_simple_message(self.extract_text_from_blocks(blocks))
+                    logger.info("🔄 Trying fallback text format...")
+                    if fallback_text is None:
+                        fallback_text = self.extract_text_from_blocks(blocks)
+                    return self.send_simple_message(fallback_text)
                 return False
                 
         except Exception as e:
-            print(f"❌ Error sending to Slack: {e}")
+            logger.error(f"❌ Error sending to Slack: {e}")
             return False
     
     def extract_text_from_blocks(self, blocks: List[Dict[str, Any]]) -> str:
@@ -1010,11 +1666,6 @@ class SlackClient:
         """Send a simple text message to Slack as fallback."""
         if not self.bot_token or not self.channel_id:
             return False
-            
-        headers = {
-            "Authorization": f"Bearer {self.bot_token}",
-            "Content-Type": "application/json"
-        }
         
         # Truncate text to Slack's limit
         truncated_text = self.truncate_text(text, MAX_SLACK_SIMPLE_LENGTH)
@@ -1025,61 +1676,96 @@ class SlackClient:
         }
         
         try:
-            response = requests.post(SLACK_API_BASE, headers=headers, json=payload)
+            response = self._post(payload)
             response.raise_for_status()
             
             result = response.json()
             if result.get('ok'):
-                print("✅ Fallback message sent to Slack successfully!")
+                logger.info("✅ Fallback message sent to Slack successfully!")
                 return True
             else:
-                print(f"❌ Fallback message failed: {result.get('error')}")
+                logger.error(f"❌ Fallback message failed: {result.get('error')}")
                 return False
                 
         except Exception as e:
-            print(f"❌ Error sending fallback message: {e}")
+            logger.error(f"❌ Error sending fallback message: {e}")
             return False
     
     def send_pr_summary(self, summary: str, pr_count: int, time_range: str, repo: str) -> bool:
         """Send PR summary to Slack with proper formatting."""
+        formatted_summary = self.format_for_slack(summary)
+        
         # Create properly formatted Slack blocks
-        blocks = self.create_slack_blocks(summary, pr_count, time_range, repo)
+        blocks = self._build_slack_blocks(formatted_summary, pr_count, time_range, repo)
+        
+        # The formatted summary doubles as the plain-text fallback
+        fallback_text = f"🚀 Weekly Development Digest - {repo}\n\n{formatted_summary}"
+        
+        # Slack rejects messages with too many blocks; plain text holds far more
+        if len(blocks) > SLACK_MAX_BLOCKS:
+            logger.warning(f"⚠️ Summary needs {len(blocks)} Slack blocks (limit {SLACK_MAX_BLOCKS}), sending it as plain text")
+            return self.send_simple_message(fallback_text)
+        
+        return self.send_message(blocks, fallback_text)
+    
+    def send_multi_pr_summary(self, results: List[Dict[str, Any]], time_range: str) -> bool:
+        """Send the digests of several repositories (analyze_repo results) as one Slack message."""
+        summarized = [result for result in results if result['summary']]
+        failed = [result for result in results if not result['summary']]
+        total_prs = sum(result['pr_count'] for result in summarized)
+        
+        title = f"🚀 Weekly Development Digest - {len(results)} repositories"
+        blocks = [
+            _header_block(title),
+            _context_block(f"🎉 {total_prs} awesome changes shipped this week! | 📅 {time_range} | ⏰ {_run_timestamp()}"),
+            _DIVIDER
+        ]
+        fallback_parts = [title]
+        
+        for result in summarized:
+            formatted_summary = self.format_for_slack(result['summary'])
+            blocks.append(_header_block(f"📦 {result['repo']}"))
+            blocks.append(_context_block(f"🎉 {result['pr_count']} awesome changes shipped"))
+            blocks.extend(self._summary_body_blocks(formatted_summary))
+            blocks.append(_DIVIDER)
+            fallback_parts.append(f"📦 {result['repo']}\n\n{formatted_summary}")
+        
+        if failed:
+            failures = "\n".join(
+                f"⚠️ *{result['repo']}*: {result['message']}"
+                for result in failed
+            )
+            blocks.extend(_section_block(chunk) for chunk in _split_paragraphs(failures))
+            fallback_parts.append(failures)
+        elif blocks[-1] is _DIVIDER:
+            blocks.pop()  # The footer starts with its own divider
+        
+        blocks.extend(_SLACK_FOOTER_BLOCKS)
+        
+        if len(blocks) > SLACK_MAX_BLOCKS:
+            logger.warning(f"⚠️ Combined digest needs {len(blocks)} Slack blocks (limit {SLACK_MAX_BLOCKS}), sending one message per repo")
+            sent = [self.send_pr_summary(result['summary'], result['pr_count'], time_range, result['repo']) for result in summarized]
+            sent.extend(
+                self.send_error_notification(result['message'], result['repo'])
+                for result in failed
+            )
+            return all(sent)
         
-        return self.send_message(blocks)
+        return self.send_message(blocks, "\n\n".join(fallback_parts))
     
     def send_error_notification(self, error_message: str, repo: str) -> bool:
         """Send error notification to Slack."""
         blocks = [
-            {
-                "type": "header",
-                "text": {
-                    "type": "plain_text",
-                    "text": "❌ Development Summary Generation Failed",
-                    "emoji": True
-                }
-            },
-            {
-                "type": "section",
-                "text": {
-                    "type": "mrkdwn",
-                    "text": f"Failed to generate development summary for {repo}: {error_message}"
-                }
-            },
-            {
-                "type": "context",
-                "elements": [
-                    {
-                        "type": "mrkdwn",
-                        "text": f"⏰ {datetime.now().strftime('%Y-%m-%d %H:%M UTC')}"
-                    }
-                ]
-            }
+            _header_block("❌ Development Summary Generation Failed"),
+            _section_block(f"Failed to generate development summary for {repo}: {error_message}"),
+            _context_block(f"⏰ {_run_timestamp()}")
         ]
         
         return self.send_message(blocks) 
 
 def get_user_time_range() -> str:
     """Interactive time range selection."""
+    _flush_log()
     print("\n⏰ Select Time Range:")
     print("1. Last week (1w)")
     print("2. Last month (1m)")
@@ -1091,59 +1777,49 @@ def get_user_time_range() -> str:
     while True:
         choice = input("\nEnter choice (1-6): ").strip()
         
-        if choice == '1': return '1w'
-        elif choice == '2': return '1m'
-        elif choice == '3': return '6m'
-        elif choice == '4': return '1y'
+        if choice in _TIME_RANGE_CHOICES:
+            return _TIME_RANGE_CHOICES[choice]
         elif choice == '5':
             start_date = input("Enter start date (YYYY-MM-DD): ").strip()
-            try:
-                datetime.fromisoformat(start_date)
+            if _is_valid_date(start_date):
                 return f"custom:{start_date}"
-            except ValueError:
-                print("❌ Invalid date format. Use YYYY-MM-DD")
-                continue
+            print("❌ Invalid date format. Use YYYY-MM-DD")
         elif choice == '6':
             start_date = input("Start date (YYYY-MM-DD): ").strip()
             end_date = input("End date (YYYY-MM-DD): ").strip()
-            try:
-                datetime.fromisoformat(start_date)
-                datetime.fromisoformat(end_date)
+            if _is_valid_date(start_date) and _is_valid_date(end_date):
                 return f"custom:{start_date}:{end_date}"
-            except ValueError:
-                print("❌ Invalid date format. Use YYYY-MM-DD")
-                continue
+            print("❌ Invalid date format. Use YYYY-MM-DD")
         else:
             print("❌ Invalid choice. Enter 1-6.")
 
 
-def main() -> None:
-    """Main function to run the PR analyzer."""
-    parser = argparse.ArgumentParser(description='GitHub PR Analyzer with Linear Integration and Slack Support')
-    parser.add_argument('repo', help='Repository name (e.g., DrivetrainAi/drive)')
-    parser.add_argument('--branches', nargs='+', default=DEFAULT_BRANCHES, 
-                       help=f'Branches to analyze (default: {" ".join(DEFAULT_BRANCHES)})')
-    parser.add_argument('--time-range', default=DEFAULT_TIME_RANGE,
-                       help='Time range (1w, 1m, 6m, 1y, custom:YYYY-MM-DD)')
-    parser.add_argument('--output', help='Output markdown file')
-    parser.add_argument('--github-token', help='GitHub token')
-    parser.add_argument('--openai-key', help='OpenAI API key')
-    parser.add_argument('--linear-token', help='Linear API key')
-    parser.add_argument('--slack-bot-token', help='Slack bot token')
-    parser.add_argument('--slack-channel-id', help='Slack channel ID')
-    parser.add_argument('--send-to-slack', action='store_true', help='Send summary to Slack')
-    parser.add_argument('--interactive', action='store_true', help='Interactive mode')
-    parser.add_argument('--no-save-raw-data', action='store_false', dest='save_raw_data',
-                       help='Disable saving raw GitHub data to JSON file')
-    
-    args = parser.parse_args()
+def _output_path(output: Optional[str], repo: Optional[str] = None) -> str:
+    """Get the summary file path, suffixed with the repo name when one of several repos is given."""
+    repo_slug = f"_{repo.replace('/', '_')}" if repo else ""
+    if output:
+        base, ext = os.path.splitext(output)
+        return f"{base}{repo_slug}{ext}"
+    return f"development_summary{repo_slug}_{_run_file_timestamp()}.md"
+
+def analyze_repo(repo: str, args: argparse.Namespace, multi_repo: bool = False) -> Dict[str, Any]:
+    """Fetch, summarize, save and optionally post the digest for one repository, returning a result dict."""
+    result = {
+        'repo': repo, 'success': False, 'summary': None, 'pr_count': 0,
+        'output_file': None, 'error': None, 'message': None
+    }
+    send_to_slack = args.send_to_slack and not multi_repo
     
-    # Initialize analyzer and Slack client
     analyzer = GitHubPRAnalyzer(
         github_token=args.github_token,
+        github_tokens=args.github_tokens,
         openai_key=args.openai_key,
         linear_token=args.linear_token,
-        save_raw_data=args.save_raw_data
+        save_raw_data=args.save_raw_data,
+        use_cache=args.use_cache,
+        stream_output=args.stream,
+        refresh=args.refresh,
+        full_refresh=args.full_refresh
     )
     
     slack_client = SlackClient(
@@ -1155,73 +1831,146 @@ def main() -> None:
         # Check for required tokens
         if not analyzer.github_token:
             error_msg = "GitHub token is required for private repositories."
-            print(f"❌ {error_msg}")
-            if args.send_to_slack:
-                slack_client.send_error_notification(error_msg, args.repo)
-            return
+            logger.error(f"❌ {error_msg}")
+            result['message'] = error_msg
+            if send_to_slack:
+                slack_client.send_error_notification(error_msg, repo)
+            return result
         
         if not analyzer.openai_key:
             error_msg = "OpenAI API key is required for generating summaries."
-            print(f"❌ {error_msg}")
-            if args.send_to_slack:
-                slack_client.send_error_notification(error_msg, args.repo)
-            return
+            logger.error(f"❌ {error_msg}")
+            result['message'] = error_msg
+            if send_to_slack:
+                slack_client.send_error_notification(error_msg, repo)
+            return result
         
-        # Get time range
         time_range = args.time_range
-        if args.interactive or not time_range:
-            time_range = get_user_time_range()
-        
-        print(f"\n🚀 Analyzing PRs from {args.repo}")
-        print(f"📅 Time range: {time_range}")
-        print(f"🌿 Branches: {', '.join(args.branches)}")
+        logger.info(f"\n🚀 Analyzing PRs from {repo}")
+        logger.info(f"📅 Time range: {time_range}")
+        logger.info(f"🌿 Branches: {', '.join(args.branches)}")
         
         # Fetch PRs
-        prs = analyzer.fetch_prs(args.repo, args.branches, time_range)
+        prs = analyzer.fetch_prs(repo, args.branches, time_range)
         
         if not prs:
             message = "No PRs found in the specified time range."
-            print(f"❌ {message}")
-            if args.send_to_slack:
-                slack_client.send_error_notification(message, args.repo)
-            return
+            logger.error(f"❌ {message}")
+            result['message'] = message
+            if send_to_slack:
+                slack_client.send_error_notification(message, repo)
+            return result
         
-        print(f"✅ Found {len(prs)} PRs")
+        logger.info(f"✅ Found {len(prs)} PRs")
         
         # Generate summary
         summary = analyzer.generate_beautiful_summary(prs, time_range)
         
-        # Format summary with PR links
-        formatted_summary = analyzer._format_summary_with_links(summary, prs, args.repo)
-        
-        # Count PRs for stats
-        pr_matches = re.findall(r'#(\d+)', summary)
-        pr_count = len(set(pr_matches))
+        # Format summary with PR links and count the PRs it mentions
+        formatted_summary, pr_count = analyzer._format_summary_with_links(summary, prs, repo)
         
         # Save to file
-        if args.output:
-            analyzer.save_summary(formatted_summary, args.output)
-        else:
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            default_filename = f"development_summary_{timestamp}.md"
-            analyzer.save_summary(formatted_summary, default_filename)
+        output_file = _output_path(args.output, repo if multi_repo else None)
+        analyzer.save_summary(formatted_summary, output_file)
         
-        # Print to console
-        analyzer.print_summary(formatted_summary)
+        # Print to console, unless it was already streamed there
+        if not analyzer.summary_streamed:
+            analyzer.print_summary(formatted_summary)
         
         # Send to Slack if requested
-        if args.send_to_slack:
-            success = slack_client.send_pr_summary(formatted_summary, pr_count, time_range, args.repo)
+        if send_to_slack:
+            success = slack_client.send_pr_summary(formatted_summary, pr_count, time_range, repo)
             if not success:
-                print("⚠️ Failed to send to Slack, but summary was generated successfully")
+                logger.warning("⚠️ Failed to send to Slack, but summary was generated successfully")
+        
+        result.update(success=True, summary=formatted_summary, pr_count=pr_count, output_file=output_file)
         
     except Exception as e:
         error_msg = f"Unexpected error: {str(e)}"
-        print(f"❌ {error_msg}")
-        if args.send_to_slack:
-            slack_client.send_error_notification(error_msg, args.repo)
-        sys.exit(1)
+        logger.error(f"❌ {error_msg}")
+        if send_to_slack:
+            slack_client.send_error_notification(error_msg, repo)
+        result.update(error=error_msg, message=error_msg)
+    
+    return result
 
+def main() -> None:
+    """Main function to run the PR analyzer."""
+    parser = argparse.ArgumentParser(description='GitHub PR Analyzer with Linear Integration and Slack Support')
+    parser.add_argument('repo', nargs='+', help='Repository name(s) (e.g., DrivetrainAi/drive)')
+    parser.add_argument('--branches', nargs='+', default=DEFAULT_BRANCHES, 
+                       help=f'Branches to analyze (default: {" ".join(DEFAULT_BRANCHES)})')
+    parser.add_argument('--time-range', default=DEFAULT_TIME_RANGE,
+                       help='Time range (1w, 1m, 6m, 1y, custom:YYYY-MM-DD)')
+    parser.add_argument('--output', help='Output markdown file (suffixed with the repo name when analyzing several repos)')
+    parser.add_argument('--github-token', help='GitHub token')
+    parser.add_argument('--github-tokens', type=lambda value: [t.strip() for t in value.split(',') if t.strip()],
+                       help='Comma-separated GitHub tokens from different accounts, rotated per request')
+    parser.add_argument('--openai-key', help='OpenAI API key')
+    parser.add_argument('--linear-token', help='Linear API key')
+    parser.add_argument('--slack-bot-token', help='Slack bot token')
+    parser.add_argument('--slack-channel-id', help='Slack channel ID')
+    parser.add_argument('--send-to-slack', action='store_true', help='Send summary to Slack')
+    parser.add_argument('--interactive', action='store_true', help='Interactive mode')
+    parser.add_argument('--no-save-raw-data', action='store_false', dest='save_raw_data',
+                       help='Disable saving raw GitHub data to JSON file')
+    parser.add_argument('--no-cache', action='store_false', dest='use_cache',
+                       help='Disable the on-disk GitHub response, PR and summary caches')
+    parser.add_argument('--stream', action='store_true',
+                       help='Print the summary to the console as it is generated')
+    parser.add_argument('--refresh', action='store_true',
+                       help='Revalidate cached GitHub data instead of reusing it while fresh')
+    parser.add_argument('--full-refresh', action='store_true',
+                       help='Fetch the whole time range instead of only PRs merged since the last run')
+    parser.add_argument('--max-parallel', type=int, default=MAX_PARALLEL_REPOS,
+                       help='Maximum number of repos analyzed concurrently')
+    parser.add_argument('--serial', action='store_true',
+                       help='Analyze multiple repos one at a time instead of concurrently')
+    
+    args = parser.parse_args()
+    _run_started()  # Pin the run's start time so every repo's files and messages share it
+    repos = list(dict.fromkeys(args.repo))
+    
+    try:
+        # Get time range once, before any repo work starts
+        if args.interactive or not args.time_range:
+            args.time_range = get_user_time_range()
+        
+        if len(repos) == 1:
+            results = [analyze_repo(repos[0], args)]
+        elif args.serial:
+            results = [analyze_repo(repo, args, multi_repo=True) for repo in repos]
+        else:
+            if args.stream:
+                logger.warning("⚠️ --stream is ignored when analyzing repos concurrently; use --serial to stream")
+                args.stream = False
+            # Repos are independent and network-bound, so analyze them concurrently,
+            # prefixing each one's log lines with its name
+            def analyze_prefixed(repo: str) -> Dict[str, Any]:
+                _log_repo.set(repo)
+                try:
+                    return analyze_repo(repo, args, multi_repo=True)
+                finally:
+                    _log_repo.set(None)
+            
+            with ThreadPoolExecutor(max_workers=max(1, min(args.max_parallel, len(repos)))) as executor:
+                results = list(executor.map(analyze_prefixed, repos))
+        
+        if len(results) > 1:
+            for result in results:
+                status = "✅" if result['success'] else "❌"
+                logger.info(f"{status} {result['repo']}: {result['output_file'] or result['message']}")
+        
+        # Several repos are posted together as one Slack message
+        if args.send_to_slack and len(results) > 1:
+            slack_client = SlackClient(bot_token=args.slack_bot_token, channel_id=args.slack_channel_id)
+            if not slack_client.send_multi_pr_summary(results, args.time_range):
+                logger.warning("⚠️ Failed to send to Slack, but summaries were generated successfully")
+        
+        if any(result['error'] for result in results):
+            sys.exit(1)
+    finally:
+        _flush_log()
 
 if __name__ == '__main__':
     main() 
\ No newline at end of file
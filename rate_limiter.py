@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Client-side Rate Limiting
+Token buckets that pace GitHub and OpenAI requests before they are sent, and
+rotation over several GitHub tokens.
+"""
+
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+class TokenBucket:
+    """Thread-safe token bucket that reserves tokens on credit and sleeps until they refill."""
+    
+    def __init__(self, capacity: float, rate_per_sec: float):
+        """Initialize a full bucket."""
+        self.capacity = capacity
+        self.rate_per_sec = rate_per_sec
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def _reserve(self, n: float) -> float:
+        """Take n tokens and return how long the caller must wait before using them."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate_per_sec)
+            self._updated = now
+            self._tokens -= n
+            return max(0.0, -self._tokens / self.rate_per_sec)
+    
+    def acquire(self, n: float = 1) -> None:
+        """Block until n tokens are available."""
+        wait = self._reserve(n)
+        if wait > 0:
+            time.sleep(wait)
+    
+    def refund(self, n: float = 1) -> None:
+        """Return n tokens taken for a request that turned out to be free."""
+        with self._lock:
+            self._tokens = min(self.capacity, self._tokens + n)
+    
+    def pause(self, seconds: float) -> None:
+        """Empty the bucket so no tokens are handed out for the next seconds."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate_per_sec)
+            self._updated = now
+            self._tokens = min(self._tokens, -seconds * self.rate_per_sec)
+    
+    async def acquire_async(self, n: float = 1) -> None:
+        """Wait until n tokens are available without blocking the event loop."""
+        wait = self._reserve(n)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+# GitHub allows 5000 authenticated requests per hour; keep a small burst allowance
+GITHUB_BUCKET = TokenBucket(capacity=20, rate_per_sec=5000 / 3600)
+
+# The Search API has its own limit of 30 requests per minute; no burst keeps
+# every rolling minute inside it
+GITHUB_SEARCH_BUCKET = TokenBucket(capacity=1, rate_per_sec=30 / 60)
+
+# OpenAI tier-1 gpt-4o-mini allows 500 requests per minute
+OPENAI_BUCKET = TokenBucket(capacity=10, rate_per_sec=500 / 60)
+
+# Per-token GitHub buckets, shared by every analyzer in the process
+_github_buckets: Dict[Tuple[int, str], TokenBucket] = {}
+_github_buckets_lock = threading.Lock()
+
+def _token_bucket(template: TokenBucket, token: Optional[str]) -> TokenBucket:
+    """Get the bucket with the template's limits that paces requests made with a token."""
+    if not token:
+        return template
+    with _github_buckets_lock:
+        key = (id(template), token)
+        bucket = _github_buckets.get(key)
+        if bucket is None:
+            bucket = _github_buckets[key] = TokenBucket(template.capacity, template.rate_per_sec)
+        return bucket
+
+def github_bucket(token: Optional[str]) -> TokenBucket:
+    """Get the bucket pacing requests made with a GitHub token."""
+    return _token_bucket(GITHUB_BUCKET, token)
+
+def search_bucket(token: Optional[str]) -> TokenBucket:
+    """Get the bucket pacing Search API requests made with a GitHub token."""
+    return _token_bucket(GITHUB_SEARCH_BUCKET, token)
+
+class TokenPool:
+    """Round-robins requests over several API tokens, skipping ones cooling down after a rate limit."""
+    
+    def __init__(self, tokens: List[str]):
+        """Initialize the pool with distinct tokens, in rotation order."""
+        self.tokens = list(dict.fromkeys(tokens))
+        self._cycle = itertools.cycle(self.tokens)
+        self._cooling: List[Tuple[float, str]] = []  # Heap of (ready_at, token)
+        self._lock = threading.Lock()
+    
+    def next(self) -> str:
+        """Get the next token in rotation that isn't cooling down."""
+        while True:
+            with self._lock:
+                now = time.time()
+                while self._cooling and self._cooling[0][0] <= now:
+                    heapq.heappop(self._cooling)
+                cooling = {token for _, token in self._cooling}
+                if len(cooling) < len(self.tokens):
+                    token = next(self._cycle)
+                    while token in cooling:
+                        token = next(self._cycle)
+                    return token
+                wait = self._cooling[0][0] - now
+            time.sleep(wait)
+    
+    def cooldown(self, token: str, until: float) -> None:
+        """Take a token out of rotation until the given epoch time."""
+        with self._lock:
+            heapq.heappush(self._cooling, (until, token))
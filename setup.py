@@ -19,7 +19,7 @@ setup(
     long_description=long_description,
     long_description_content_type="text/markdown",
     url="https://github.com/your-org/weekly-digest",
-    py_modules=["github_pr_analyzer", "chunked_summarizer"],
+    py_modules=["github_pr_analyzer", "chunked_summarizer", "github_cache", "rate_limiter"],
     classifiers=[
         "Development Status :: 4 - Beta",
         "Intended Audience :: Developers",